@@ -0,0 +1,67 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from blog_tools.cli import KAFKA_DIR
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAG_SNAPSHOT = os.path.join(KAFKA_DIR, "results.csv")
+
+
+def cases(out_dir):
+    """(label, argv) for each command to time, cheapest first.
+
+    The interpreter on its own is the floor every command pays; the eager
+    imports are what each regression run loaded before pandas and
+    matplotlib were imported lazily.
+    """
+    cli = [sys.executable, "-m", "blog_tools.cli"]
+    return [
+        ("python (no imports)", [sys.executable, "-c", "pass"]),
+        (
+            "eager numpy+pandas+pyplot",
+            [sys.executable, "-c", "import numpy, pandas, matplotlib.pyplot"],
+        ),
+        ("blog lag", [*cli, "lag", LAG_SNAPSHOT]),
+        ("blog fit --solver lstsq", [*cli, "fit", "--solver", "lstsq"]),
+        ("blog fit (gradient descent)", [*cli, "fit"]),
+        (
+            "blog fit --bootstrap 2000",
+            [*cli, "fit", "--solver", "lstsq", "--bootstrap", "2000"],
+        ),
+        (
+            "blog plot --headless",
+            [*cli, "plot", "--headless", "--out", os.path.join(out_dir, "salary_plot.png")],
+        ),
+    ]
+
+
+def time_command(argv, repeat):
+    """Wall-clock seconds of `repeat` fresh runs of `argv`."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, check=True, cwd=ROOT, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time the cold start of each blog CLI command in a fresh interpreter."
+    )
+    parser.add_argument("--repeat", type=int, default=10, help="runs per command")
+    args = parser.parse_args()
+
+    print(f"{'Command':<32} {'Min ms':>8} {'Median ms':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, argv in cases(tmp):
+            # One untimed run first, so every command is timed with a warm page cache
+            time_command(argv, 1)
+            times = time_command(argv, args.repeat)
+            median = statistics.median(times)
+            print(f"{label:<32} {min(times) * 1000:>8.0f} {median * 1000:>10.0f}")
@@ -0,0 +1,76 @@
+import argparse
+import importlib
+import os
+import sys
+
+# The scripts live next to the posts that explain them, so readers can
+# download them from the site; the CLI runs them from there
+POSTS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "jfgrea27.github.io",
+    "static",
+    "posts",
+)
+KAFKA_DIR = os.path.join(POSTS_DIR, "03-kafka-patterns", "04-partitions-vs-throughput")
+REGRESSION_DIR = os.path.join(POSTS_DIR, "06-ml-math", "01-linear-regression")
+
+# command: (script directory, module, extra main() arguments, help)
+COMMANDS = {
+    "lag": (
+        KAFKA_DIR,
+        "calculate_avg_lag",
+        {},
+        "summarise consumer lag from kafka-consumer-groups --describe output",
+    ),
+    "fit": (
+        REGRESSION_DIR,
+        "linear_regression",
+        # Compute-only unless --plot is given, so matplotlib is never imported
+        {"plot": False},
+        "fit salary vs experience and print the parameters",
+    ),
+    "plot": (
+        REGRESSION_DIR,
+        "plot_salary",
+        {},
+        "scatter plot of salary vs experience",
+    ),
+}
+
+
+def load_command(command):
+    """Import the script behind `command`, with its directory on sys.path.
+
+    Only the chosen script is imported, and the scripts import their
+    heavy dependencies (pandas, matplotlib) only where they use them.
+    """
+    script_dir, module, _, _ = COMMANDS[command]
+    if not os.path.isdir(script_dir):
+        sys.exit(
+            f"Scripts not found in {script_dir}; "
+            "install the CLI from a checkout with `pip install -e .`"
+        )
+    # The scripts import their siblings (e.g. lag_tracker) by bare name
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    return importlib.import_module(module)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="blog", description="Run the analysis scripts from the blog's posts."
+    )
+    parser.add_argument(
+        "command",
+        choices=COMMANDS,
+        help="; ".join(f"{name}: {spec[3]}" for name, spec in COMMANDS.items()),
+    )
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments for the command")
+    args = parser.parse_args(argv)
+
+    _, _, kwargs, _ = COMMANDS[args.command]
+    load_command(args.command).main(args.args, prog=f"blog {args.command}", **kwargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from calculate_avg_lag import ENGINES
+
+HEADER = "GROUP,TOPIC,PARTITION,CURRENT-OFFSET,LOG-END-OFFSET,LAG\n"
+
+
+def write_synthetic_dump(path, n_rows, n_topics, seed=0):
+    """Write a results.csv-style dump with `n_rows` partitions over `n_topics` topics."""
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write(HEADER)
+        for i in range(n_rows):
+            topic = f"topic-{i % n_topics}"
+            current = rng.randint(0, 1_000_000)
+            lag = rng.randint(0, 5_000)
+            f.write(
+                f"demo-consumer-group,{topic},{i // n_topics},{current},{current + lag},{lag}\n"
+            )
+
+
+def run_benchmark(n_rows, n_topics, engines):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "lag.csv")
+        write_synthetic_dump(path, n_rows, n_topics)
+
+        reference = None
+        print(f"{'Engine':<10} {'Seconds':>10} {'Rows/sec':>14}")
+        for name in engines:
+            start = time.perf_counter()
+            stats = ENGINES[name](path)
+            elapsed = time.perf_counter() - start
+
+            # Every engine must agree with the first one exactly
+            summary = {
+                key: (s.count, s.total, s.total_sq, s.min, s.max)
+                for key, s in stats.items()
+            }
+            if reference is None:
+                reference = summary
+            elif summary != reference:
+                raise AssertionError(f"Engine '{name}' disagrees with '{engines[0]}'")
+
+            print(f"{name:<10} {elapsed:>10.3f} {n_rows / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare lag aggregation engines.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument(
+        "--engines", nargs="+", choices=sorted(ENGINES), default=sorted(ENGINES)
+    )
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.topics, args.engines)
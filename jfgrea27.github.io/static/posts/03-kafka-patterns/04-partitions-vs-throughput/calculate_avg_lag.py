@@ -1,63 +1,370 @@
+import argparse
 import csv
+import io
+import mmap
+import os
 import sys
 
 
-def calculate_average_lag(file_path, target_topic):
-    lags = []
+class LagStats:
+    """Running lag statistics for a single (GROUP, TOPIC) pair.
 
+    Only integer count/sum/sum-of-squares are kept, so memory is constant
+    per pair and partial results can be merged exactly.
+    """
+
+    __slots__ = ("count", "total", "total_sq", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.total_sq = 0
+        self.min = None
+        self.max = None
+
+    def add(self, lag):
+        self.count += 1
+        self.total += lag
+        self.total_sq += lag * lag
+        if self.min is None or lag < self.min:
+            self.min = lag
+        if self.max is None or lag > self.max:
+            self.max = lag
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self):
+        # Population variance, computed from exact integer sums
+        if not self.count:
+            return 0.0
+        n = self.count
+        return (n * self.total_sq - self.total * self.total) / (n * n)
+
+
+# Delimiters recognised in the header line, in order of preference
+DELIMITERS = (",", "\t", ";", "|")
+
+
+def detect_delimiter(line):
+    """Return the delimiter used in a header `line`, or None for a whitespace table."""
+    for delimiter in DELIMITERS:
+        if delimiter in line:
+            return delimiter
+    return None
+
+
+def make_rows(lines, delimiter):
+    """Split `lines` into fields; a None delimiter splits on runs of whitespace."""
+    if delimiter is None:
+        # None of the describe columns contain spaces, and missing values are
+        # printed as "-", so a plain split recovers the table's columns
+        return (line.split() for line in lines)
+    # skipinitialspace=True helps with some whitespace handling
+    return csv.reader(lines, delimiter=delimiter, skipinitialspace=True)
+
+
+def find_header(f):
+    """Read `f` up to and including its header row.
+
+    The header is the first line naming both TOPIC and LAG (as in
+    lag_follow.read_header), so the blank line and any status line such as
+    "Consumer group 'g1' has no active members." that the CLI prints above
+    the table are skipped. Returns (stripped header row, delimiter, lines
+    skipped before the header); if no line qualifies, the first non-blank
+    row is returned instead, for the caller's warning, with None skipped.
+    """
+    first = None
+    skipped = 0
+    for line in iter(f.readline, ""):
+        if "TOPIC" in line and "LAG" in line:
+            break
+        if first is None and line.strip():
+            first = line
+        skipped += 1
+    else:
+        line, skipped = first, None
+        if line is None:
+            return None, None, None
+
+    delimiter = detect_delimiter(line)
+    header = next(iter(make_rows([line], delimiter)))
+    # Clean headers (strip whitespace from keys just in case)
+    return [h.strip() for h in header], delimiter, skipped
+
+
+def open_lag_reader(f):
+    """Return a row iterator over `f`, the (stripped) header row and the delimiter."""
+    header, delimiter, _ = find_header(f)
+    return make_rows(f, delimiter), header, delimiter
+
+
+def has_lag_columns(header):
+    if not header or "TOPIC" not in header or "LAG" not in header:
+        print(
+            f"Warning: Expected columns 'TOPIC' and 'LAG' not found. Found: {header}"
+        )
+        return False
+    return True
+
+
+def aggregate_rows(rows, header, target_topic, stats):
+    """Fold parsed `rows` into `stats`, a dict of (group, topic) -> LagStats.
+
+    Blank lines, repeated headers and "-" lags (no committed offset) in CLI
+    output are skipped along with any other row without an integer lag.
+    """
+    topic_idx = header.index("TOPIC")
+    lag_idx = header.index("LAG")
+    group_idx = header.index("GROUP") if "GROUP" in header else None
+    width = max(topic_idx, lag_idx, group_idx or 0) + 1
+
+    for row in rows:
+        if len(row) < width:
+            continue
+
+        topic = row[topic_idx].strip()
+        if not topic or (target_topic is not None and topic != target_topic):
+            continue
+
+        try:
+            lag = int(row[lag_idx])
+        except ValueError:
+            continue
+
+        group = row[group_idx].strip() if group_idx is not None else ""
+        key = (group, topic)
+        entry = stats.get(key)
+        if entry is None:
+            entry = stats[key] = LagStats()
+        entry.add(lag)
+
+    return stats
+
+
+def aggregate_lag(file_path, target_topic=None):
+    """Aggregate lag per (GROUP, TOPIC) in a single pass over `file_path`.
+
+    If `target_topic` is given, rows for other topics are skipped. Returns a
+    dict mapping (group, topic) to LagStats, or None if the file has no
+    TOPIC/LAG columns.
+    """
+    stats = {}
+
+    with open(file_path, "r", newline="") as f:
+        rows, header, _ = open_lag_reader(f)
+        if not has_lag_columns(header):
+            return None
+
+        aggregate_rows(rows, header, target_topic, stats)
+
+    return stats
+
+
+def aggregate_lag_pandas(file_path, target_topic=None):
+    """Columnar equivalent of `aggregate_lag` backed by pandas.
+
+    Parses the lag columns into typed arrays and aggregates with a single
+    groupby, instead of building a Python object per row.
+    """
+    import pandas as pd
+
+    with open(file_path, "r", newline="") as f:
+        header, delimiter, skipped = find_header(f)
+
+    if not has_lag_columns(header):
+        return None
+
+    columns = [c for c in ("GROUP", "TOPIC", "LAG") if c in header]
+    read_kwargs = dict(
+        sep=delimiter,
+        skipinitialspace=True,
+        # Start after the header row and anything the CLI printed above it
+        skiprows=skipped + 1,
+        header=None,
+        names=header,
+        usecols=columns,
+    )
+    if delimiter is None:
+        # Whitespace table: status lines such as "Consumer group ... has no
+        # active members." may not line up with the header, so drop them
+        read_kwargs.update(sep=r"\s+", skipinitialspace=False, on_bad_lines="skip")
+    try:
+        # Fast path: every LAG is a clean integer, so the C parser types it directly
+        df = pd.read_csv(
+            file_path,
+            dtype={"GROUP": "category", "TOPIC": "category", "LAG": "int64"},
+            **read_kwargs,
+        )
+        df = df[df["TOPIC"].notna()]
+    except ValueError:
+        # Slow path: drop rows with a missing topic or a non-integer lag, as the csv engine does
+        df = pd.read_csv(file_path, dtype="string", **read_kwargs)
+        lag = df["LAG"].str.strip()
+        keep = df["TOPIC"].notna() & lag.str.fullmatch(r"[+-]?\d+").fillna(False)
+        df = df[keep].assign(LAG=lag[keep].astype("int64"))
+
+    if "GROUP" not in df:
+        df = df.assign(GROUP="")
+
+    # int64 squares are exact for lags below ~3e9 messages per partition
+    df = df.assign(LAG_SQ=df["LAG"] * df["LAG"])
+
+    grouped = df.groupby(["GROUP", "TOPIC"], sort=False, observed=True, dropna=False).agg(
+        count=("LAG", "size"),
+        total=("LAG", "sum"),
+        total_sq=("LAG_SQ", "sum"),
+        min=("LAG", "min"),
+        max=("LAG", "max"),
+    )
+
+    # Names are cleaned per group rather than per row; keys that only
+    # differed by whitespace are merged back together
+    stats = {}
+    for (group, topic), row in zip(grouped.index, grouped.itertuples(index=False)):
+        group = "" if pd.isna(group) else str(group).strip()
+        topic = str(topic).strip()
+        if not topic or (target_topic is not None and topic != target_topic):
+            continue
+
+        s = LagStats()
+        s.count = int(row.count)
+        s.total = int(row.total)
+        s.total_sq = int(row.total_sq)
+        s.min = int(row.min)
+        s.max = int(row.max)
+
+        key = (group, topic)
+        if key in stats:
+            stats[key].merge(s)
+        else:
+            stats[key] = s
+
+    return stats
+
+
+# Below this size a process pool costs more than it saves
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+
+def _chunk_bounds(mm, start, n_chunks):
+    """Split mm[start:] into about `n_chunks` ranges that end on a newline."""
+    size = len(mm)
+    step = max(1, (size - start) // n_chunks)
+    bounds = []
+    while start < size:
+        end = mm.find(b"\n", min(start + step, size - 1))
+        end = size if end == -1 else end + 1
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def _aggregate_chunk(file_path, start, end, header, target_topic, delimiter):
+    with open(file_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = mm[start:end].decode("utf-8")
+
+    rows = make_rows(io.StringIO(text, newline=""), delimiter)
+    return aggregate_rows(rows, header, target_topic, {})
+
+
+def aggregate_lag_parallel(file_path, target_topic=None, workers=None):
+    """Chunk-parallel equivalent of `aggregate_lag` for multi-GB dumps.
+
+    The file is memory-mapped and cut into chunks at newline boundaries;
+    each chunk is aggregated in a worker process and the exact integer
+    partials are merged. Assumes no field contains an embedded newline,
+    which holds for consumer-group describe output.
+    """
+    with open(file_path, "r", newline="") as f:
+        header, delimiter, skipped = find_header(f)
+        if not has_lag_columns(header):
+            return None
+
+    size = os.path.getsize(file_path)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or size < PARALLEL_MIN_BYTES:
+        return aggregate_lag(file_path, target_topic)
+
+    with open(file_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Chunks start after the header row and the lines above it
+            header_end = 0
+            for _ in range(skipped + 1):
+                end = mm.find(b"\n", header_end)
+                header_end = len(mm) if end == -1 else end + 1
+            # A few chunks per worker keeps the pool busy if chunks parse unevenly
+            bounds = _chunk_bounds(mm, header_end, workers * 4)
+
+    # Imported here: the process pool machinery is most of this module's startup time
+    from concurrent.futures import ProcessPoolExecutor
+
+    stats = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _aggregate_chunk, file_path, start, end, header, target_topic, delimiter
+            )
+            for start, end in bounds
+        ]
+        for future in futures:
+            for key, partial in future.result().items():
+                if key in stats:
+                    stats[key].merge(partial)
+                else:
+                    stats[key] = partial
+
+    return stats
+
+
+ENGINES = {
+    "csv": aggregate_lag,
+    "pandas": aggregate_lag_pandas,
+    "parallel": aggregate_lag_parallel,
+}
+
+
+def print_lag_stats(stats):
+    for (group, topic), s in sorted(stats.items()):
+        if group:
+            print(f"Group: {group}")
+        print(f"Topic: {topic}")
+        print(f"Partitions: {s.count}")
+        print(f"Total Lag: {s.total}")
+        print(f"Average Lag: {s.mean:.2f}")
+        print(f"Min Lag: {s.min}")
+        print(f"Max Lag: {s.max}")
+        print(f"Lag Variance: {s.variance:.2f}")
+        print()
+
+
+def calculate_average_lag(file_path, target_topic=None, engine="csv", **engine_kwargs):
     try:
-        with open(file_path, "r", newline="") as f:
-            # Attempt to detect the format
-            try:
-                sample = f.read(2048)
-                f.seek(0)
-                dialect = csv.Sniffer().sniff(sample)
-            except csv.Error:
-                # Default to basic CSV if sniffing fails
-                dialect = "excel"
-
-            # skipinitialspace=True helps with some whitespace handling
-            reader = csv.DictReader(f, dialect=dialect, skipinitialspace=True)
-
-            # Clean headers (strip whitespace from keys just in case)
-            if reader.fieldnames:
-                reader.fieldnames = [h.strip() for h in reader.fieldnames]
-
-            if (
-                not reader.fieldnames
-                or "TOPIC" not in reader.fieldnames
-                or "LAG" not in reader.fieldnames
-            ):
-                # If Sniffer failed us on the whitespace format, we might be here.
-                # But for the CSV file (results.csv), this should work perfectly.
-                print(
-                    f"Warning: Expected columns 'TOPIC' and 'LAG' not found. Found: {reader.fieldnames}"
-                )
-                # We continue to try and see if it works anyway or just return?
-                # Let's return to avoid confusing errors.
-                return
-
-            for row in reader:
-                # Get values safely
-                topic = row.get("TOPIC")
-                lag_str = row.get("LAG")
-
-                if topic and lag_str and topic.strip() == target_topic:
-                    try:
-                        lag = int(lag_str)
-                        lags.append(lag)
-                    except ValueError:
-                        pass
-
-        if not lags:
-            print(f"No partitions found for topic: {target_topic}")
+        stats = ENGINES[engine](file_path, target_topic, **engine_kwargs)
+        if stats is None:
             return
 
-        avg_lag = sum(lags) / len(lags)
-        print(f"Topic: {target_topic}")
-        print(f"Partitions: {len(lags)}")
-        print(f"Total Lag: {sum(lags)}")
-        print(f"Average Lag: {avg_lag:.2f}")
+        if not stats:
+            if target_topic is None:
+                print("No partitions found")
+            else:
+                print(f"No partitions found for topic: {target_topic}")
+            return
+
+        print_lag_stats(stats)
 
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.")
@@ -65,12 +372,128 @@ def calculate_average_lag(file_path, target_topic):
         print(f"An error occurred: {e}")
 
 
-if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python3 calculate_avg_lag.py <csv_file> <topic_name>")
-        sys.exit(1)
+def positive_int(value):
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def parse_args(argv=None, prog=None):
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Summarise consumer lag from `kafka-consumer-groups --describe` output."
+    )
+    parser.add_argument(
+        "csv_file",
+        help="consumer-group describe output, as CSV or the raw CLI table ('-' for stdin with --follow)",
+    )
+    parser.add_argument(
+        "topic_name",
+        nargs="?",
+        help="only report this topic (default: every (GROUP, TOPIC) pair)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=sorted(ENGINES),
+        default="csv",
+        help=(
+            "csv: pure-python row parser, pandas: columnar parser, "
+            "parallel: memory-mapped chunks over a process pool (default: csv)"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="worker processes for --engine parallel (default: CPU count)",
+    )
+    parser.add_argument(
+        "--state",
+        metavar="INDEX",
+        help=(
+            "diff the snapshot against the offsets index at INDEX and report "
+            "per-partition consume/produce rates and lag deltas, then update it"
+        ),
+    )
+    parser.add_argument(
+        "--rebalance",
+        type=positive_int,
+        metavar="CONSUMERS",
+        help=(
+            "plan a lag-balanced partition assignment over CONSUMERS consumers and "
+            "compare its max-consumer lag with the current one (with --state, "
+            "partitions are also weighted by their produce rate)"
+        ),
+    )
+    parser.add_argument(
+        "--horizon",
+        type=float,
+        default=60.0,
+        help="seconds of produce rate added to each partition's lag with --rebalance --state",
+    )
+    parser.add_argument(
+        "--plan-out",
+        metavar="CSV",
+        help="write the --rebalance assignment as GROUP,TOPIC,PARTITION,CONSUMER rows",
+    )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help=(
+            "keep reading appended output (or stdin) and print rolling per-topic "
+            "mean/p50/p99 lag and the top lagging partitions"
+        ),
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=5,
+        help="lagging partitions to list per topic with --follow (default: 5)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="seconds between --follow reports (default: 0.5)",
+    )
+    return parser.parse_args(argv)
 
-    csv_file = sys.argv[1]
-    topic_name = sys.argv[2]
 
-    calculate_average_lag(csv_file, topic_name)
+def main(argv=None, prog=None):
+    args = parse_args(argv, prog)
+
+    if args.follow:
+        from lag_follow import follow_lag
+
+        if args.csv_file == "-":
+            follow_lag(sys.stdin, args.topic_name, args.top, args.interval)
+        else:
+            with open(args.csv_file, "rb") as f:
+                follow_lag(f, args.topic_name, args.top, args.interval)
+        return
+
+    if args.rebalance is not None:
+        from lag_rebalance import report_rebalance
+
+        report_rebalance(
+            args.csv_file,
+            args.rebalance,
+            args.topic_name,
+            args.state,
+            args.horizon,
+            args.plan_out,
+        )
+        return
+
+    if args.state:
+        from lag_tracker import report_lag_trend
+
+        report_lag_trend(args.csv_file, args.state, args.topic_name)
+        return
+
+    engine_kwargs = {"workers": args.workers} if args.engine == "parallel" else {}
+    calculate_average_lag(args.csv_file, args.topic_name, args.engine, **engine_kwargs)
+
+
+if __name__ == "__main__":
+    main()
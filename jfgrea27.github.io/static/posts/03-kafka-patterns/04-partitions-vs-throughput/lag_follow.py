@@ -0,0 +1,195 @@
+import heapq
+import math
+import os
+import select
+import stat
+import sys
+import time
+
+from calculate_avg_lag import detect_delimiter, make_rows
+
+
+class LagSketch:
+    """Log-bucketed quantile sketch over non-negative integer lags.
+
+    Each bucket covers values within `relative_accuracy` of each other, so
+    a lag range up to 1e12 needs under 1,400 buckets however many values
+    are added. Values can be removed again, which lets the sketch follow a
+    partition's lag as it is replaced by newer snapshots.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.count = 0
+
+    def _index(self, value):
+        # Bucket 0 holds lags of 0 (and negative lags, which the CLI can print briefly)
+        if value <= 0:
+            return 0
+        return math.ceil(math.log(value) / self.log_gamma) + 1
+
+    def add(self, value, weight=1):
+        index = self._index(value)
+        count = self.buckets.get(index, 0) + weight
+        if count:
+            self.buckets[index] = count
+        else:
+            del self.buckets[index]
+        self.count += weight
+
+    def remove(self, value):
+        self.add(value, -1)
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                if index == 0:
+                    return 0.0
+                # Midpoint of the bucket, within relative_accuracy of every value in it
+                return 2 * self.gamma ** (index - 1) / (self.gamma + 1)
+        return None
+
+
+class TopicLag:
+    """Current lag of every partition of one (GROUP, TOPIC), updated in place."""
+
+    def __init__(self):
+        self.latest = {}
+        self.total = 0
+        self.sketch = LagSketch()
+
+    def update(self, partition, lag):
+        previous = self.latest.get(partition)
+        if previous is not None:
+            self.total -= previous
+            self.sketch.remove(previous)
+        self.latest[partition] = lag
+        self.total += lag
+        self.sketch.add(lag)
+
+    @property
+    def mean(self):
+        return self.total / len(self.latest) if self.latest else 0.0
+
+    def top(self, n):
+        return heapq.nlargest(n, self.latest.items(), key=lambda item: item[1])
+
+
+def follow_lines(f, poll_interval=0.1):
+    """Yield lines from `f` as they are written, and "" whenever none arrive.
+
+    The idle "" lets the caller refresh its report between snapshots.
+    Pipes end at EOF; regular files are polled for appended data, like
+    `tail -f`, until interrupted. The file descriptor is read directly so
+    no data can sit unseen in a Python-level buffer.
+    """
+    fd = f.fileno()
+    is_file = stat.S_ISREG(os.fstat(fd).st_mode)
+    pending = b""
+    while True:
+        if is_file or select.select([fd], [], [], poll_interval)[0]:
+            chunk = os.read(fd, 1 << 16)
+        else:
+            chunk = None
+
+        if chunk:
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                yield line.decode("utf-8") + "\n"
+        elif chunk == b"" and not is_file:
+            if pending:
+                yield pending.decode("utf-8")
+            return
+        else:
+            if is_file:
+                time.sleep(poll_interval)
+            yield ""
+
+
+def read_header(lines):
+    """Consume `lines` up to and including the header; return it and its delimiter."""
+    for line in lines:
+        if "TOPIC" in line and "LAG" in line:
+            delimiter = detect_delimiter(line)
+            header = next(iter(make_rows([line], delimiter)))
+            return [h.strip() for h in header], delimiter
+    return None, None
+
+
+def print_report(topics, top_n):
+    print(f"--- {time.strftime('%H:%M:%S')} ---")
+    for (group, topic), t in sorted(topics.items()):
+        name = f"{group}/{topic}" if group else topic
+        p50 = t.sketch.quantile(0.5)
+        p99 = t.sketch.quantile(0.99)
+        print(
+            f"{name}: partitions={len(t.latest)} mean={t.mean:.2f} "
+            f"p50={p50:.0f} p99={p99:.0f}"
+        )
+        top = ", ".join(f"p{partition}={lag}" for partition, lag in t.top(top_n))
+        print(f"  top {top_n}: {top}")
+    sys.stdout.flush()
+
+
+def follow_lag(f, target_topic=None, top_n=5, interval=0.5):
+    """Keep per-topic lag aggregates over a live stream of describe output.
+
+    A report is printed at most every `interval` seconds while lines
+    arrive, and once more when the stream ends.
+    """
+    lines = follow_lines(f)
+    header, delimiter = read_header(lines)
+    if not header or "PARTITION" not in header:
+        print(
+            f"Warning: Expected columns 'TOPIC', 'PARTITION' and 'LAG' not found. Found: {header}"
+        )
+        return
+
+    topic_idx = header.index("TOPIC")
+    partition_idx = header.index("PARTITION")
+    lag_idx = header.index("LAG")
+    group_idx = header.index("GROUP") if "GROUP" in header else None
+    width = max(topic_idx, partition_idx, lag_idx, group_idx or 0) + 1
+
+    topics = {}
+    updated = False
+    last_report = time.monotonic()
+    try:
+        for row in make_rows(lines, delimiter):
+            if len(row) >= width:
+                topic = row[topic_idx].strip()
+                if topic and (target_topic is None or topic == target_topic):
+                    try:
+                        partition = int(row[partition_idx])
+                        lag = int(row[lag_idx])
+                    except ValueError:
+                        # Repeated headers, status lines and "-" lags
+                        partition = None
+
+                    if partition is not None:
+                        group = row[group_idx].strip() if group_idx is not None else ""
+                        key = (group, topic)
+                        if key not in topics:
+                            topics[key] = TopicLag()
+                        topics[key].update(partition, lag)
+                        updated = True
+
+            now = time.monotonic()
+            if updated and now - last_report >= interval:
+                print_report(topics, top_n)
+                updated = False
+                last_report = now
+    except KeyboardInterrupt:
+        pass
+
+    if updated:
+        print_report(topics, top_n)
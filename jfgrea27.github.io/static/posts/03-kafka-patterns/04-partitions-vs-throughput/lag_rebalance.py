@@ -0,0 +1,242 @@
+import csv
+import heapq
+from collections import namedtuple
+
+from calculate_avg_lag import has_lag_columns, open_lag_reader
+
+PartitionLoad = namedtuple("PartitionLoad", ["partition", "lag", "weight", "consumer"])
+
+
+def read_partition_lags(file_path, target_topic=None, rates=None, horizon=60.0):
+    """Return {(group, topic): [PartitionLoad, ...]} for a describe snapshot.
+
+    A partition's weight is its lag, plus `horizon` seconds of its produce
+    rate when `rates` ({(group, topic, partition): offsets/s}) is given, so
+    hot partitions count for the backlog they will build as well as the
+    one they have. `consumer` is the CONSUMER-ID column, or None if the
+    snapshot has none (or the partition is unassigned).
+    """
+    loads = {}
+
+    with open(file_path, "r", newline="") as f:
+        rows, header, _ = open_lag_reader(f)
+        if not has_lag_columns(header) or "PARTITION" not in header:
+            return None
+
+        topic_idx = header.index("TOPIC")
+        partition_idx = header.index("PARTITION")
+        lag_idx = header.index("LAG")
+        group_idx = header.index("GROUP") if "GROUP" in header else None
+        consumer_idx = header.index("CONSUMER-ID") if "CONSUMER-ID" in header else None
+        width = max(topic_idx, partition_idx, lag_idx, group_idx or 0, consumer_idx or 0) + 1
+
+        for row in rows:
+            if len(row) < width:
+                continue
+
+            topic = row[topic_idx].strip()
+            if not topic or (target_topic is not None and topic != target_topic):
+                continue
+
+            try:
+                partition = int(row[partition_idx])
+            except ValueError:
+                # Repeated header or status line in CLI output
+                continue
+            try:
+                lag = int(row[lag_idx])
+            except ValueError:
+                # No committed offset yet; nothing known to drain
+                lag = 0
+
+            group = row[group_idx].strip() if group_idx is not None else ""
+            consumer = row[consumer_idx].strip() if consumer_idx is not None else ""
+            if consumer in ("", "-"):
+                consumer = None
+            weight = lag
+            if rates:
+                weight += horizon * max(rates.get((group, topic, partition)) or 0.0, 0.0)
+
+            loads.setdefault((group, topic), []).append(
+                PartitionLoad(partition, lag, weight, consumer)
+            )
+
+    return loads
+
+
+def range_assignment(partitions, n_consumers):
+    """Kafka's RangeAssignor for one topic: contiguous runs of sorted partitions.
+
+    The first len % n consumers get one extra partition.
+    """
+    ordered = sorted(partitions)
+    per_consumer, extra = divmod(len(ordered), n_consumers)
+    assignment = {}
+    start = 0
+    for consumer in range(n_consumers):
+        end = start + per_consumer + (1 if consumer < extra else 0)
+        for partition in ordered[start:end]:
+            assignment[partition] = consumer
+        start = end
+    return assignment
+
+
+def balance_partitions(loads, n_consumers):
+    """Assign partitions to consumers so the busiest consumer's load is small.
+
+    Longest-processing-time-first: partitions in decreasing weight, each
+    given to the currently least-loaded consumer, found with a min-heap.
+    That is O(P log P + P log N) for P partitions, and the heaviest
+    consumer ends within 4/3 of the best possible. Ties go to the consumer
+    with fewer partitions, so zero-lag partitions still spread out evenly.
+    """
+    heap = [(0, 0, consumer) for consumer in range(n_consumers)]
+    assignment = {}
+    for load in sorted(loads, key=lambda load: (-load.weight, load.partition)):
+        weight, count, consumer = heapq.heappop(heap)
+        assignment[load.partition] = consumer
+        heapq.heappush(heap, (weight + load.weight, count + 1, consumer))
+    return assignment
+
+
+def consumer_totals(loads, assignment, n_consumers):
+    """Per-consumer (partitions, lag, weight) under `assignment`."""
+    totals = [[0, 0, 0.0] for _ in range(n_consumers)]
+    for load in loads:
+        entry = totals[assignment[load.partition]]
+        entry[0] += 1
+        entry[1] += load.lag
+        entry[2] += load.weight
+    return totals
+
+
+def current_assignment(loads, n_consumers):
+    """The snapshot's own CONSUMER-ID assignment, else what RangeAssignor would do.
+
+    Partitions with no consumer ("-") are added to the observed assignment,
+    each to the consumer with the fewest partitions at that point, so the
+    observed consumers are never replaced by an assumed assignment. Returns
+    (assignment, n_consumers, description); n_consumers is the number of
+    consumers observed, which need not match the number requested.
+    """
+    consumers = sorted({load.consumer for load in loads if load.consumer is not None})
+    if not consumers:
+        partitions = [load.partition for load in loads]
+        return range_assignment(partitions, n_consumers), n_consumers, "current (range)"
+
+    index = {consumer: i for i, consumer in enumerate(consumers)}
+    assignment = {}
+    counts = [0] * len(consumers)
+    unassigned = []
+    for load in loads:
+        if load.consumer is None:
+            unassigned.append(load.partition)
+        else:
+            assignment[load.partition] = index[load.consumer]
+            counts[index[load.consumer]] += 1
+
+    heap = [(count, consumer) for consumer, count in enumerate(counts)]
+    heapq.heapify(heap)
+    for partition in sorted(unassigned):
+        count, consumer = heapq.heappop(heap)
+        assignment[partition] = consumer
+        heapq.heappush(heap, (count + 1, consumer))
+
+    description = "current (CONSUMER-ID)"
+    if unassigned:
+        description = f"current (+{len(unassigned)} unassigned)"
+    return assignment, len(consumers), description
+
+
+def plan_rebalance(loads, n_consumers):
+    """Compare the current assignment of one (group, topic) with a balanced one.
+
+    Returns (rows, balanced assignment) where rows are (description,
+    consumer totals) for the current and balanced assignments.
+    """
+    current, n_current, description = current_assignment(loads, n_consumers)
+    balanced = balance_partitions(loads, n_consumers)
+    rows = [
+        (description, consumer_totals(loads, current, n_current)),
+        ("balanced", consumer_totals(loads, balanced, n_consumers)),
+    ]
+    return rows, balanced
+
+
+def print_plan(group, topic, rows, weighted):
+    if group:
+        print(f"Group: {group}")
+    print(f"Topic: {topic}")
+    column = "MAX-WEIGHT" if weighted else "MAX-LAG"
+    print(
+        f"{'ASSIGNMENT':<24} {'CONSUMERS':>9} {column:>12} {'MIN':>12} "
+        f"{'MEAN':>12} {'MAX/MEAN':>9} {'PARTITIONS':>11}"
+    )
+    for description, totals in rows:
+        key = 2 if weighted else 1
+        values = [entry[key] for entry in totals]
+        counts = [entry[0] for entry in totals]
+        mean = sum(values) / len(values)
+        ratio = f"{max(values) / mean:.2f}" if mean else "-"
+        print(
+            f"{description:<24} {len(totals):>9} {max(values):>12.0f} {min(values):>12.0f} "
+            f"{mean:>12.1f} {ratio:>9} {f'{min(counts)}-{max(counts)}':>11}"
+        )
+    n_current, n_balanced = (len(totals) for _, totals in rows)
+    if n_current != n_balanced:
+        print(
+            f"Note: {n_current} consumer(s) observed vs {n_balanced} planned; "
+            "per-consumer lag is not directly comparable"
+        )
+    print()
+
+
+def write_plan(path, plans):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["GROUP", "TOPIC", "PARTITION", "CONSUMER"])
+        for (group, topic), assignment in sorted(plans.items()):
+            for partition, consumer in sorted(assignment.items()):
+                writer.writerow([group, topic, partition, consumer])
+
+
+def report_rebalance(
+    file_path, n_consumers, target_topic=None, state_path=None, horizon=60.0, plan_path=None
+):
+    """Print the current vs balanced max-consumer lag for each (group, topic).
+
+    With `state_path`, produce rates from the offsets index (see
+    lag_tracker.track_lag, which this also updates) weight each partition.
+    """
+    try:
+        rates = None
+        if state_path:
+            from lag_tracker import track_lag
+
+            deltas = track_lag(file_path, state_path, target_topic) or []
+            rates = {
+                (d.group, d.topic, d.partition): d.produce_rate
+                for d in deltas
+                if d.produce_rate is not None
+            }
+
+        loads = read_partition_lags(file_path, target_topic, rates, horizon)
+        if loads is None:
+            return
+        if not loads:
+            print("No partitions found")
+            return
+
+        plans = {}
+        for (group, topic), topic_loads in sorted(loads.items()):
+            rows, plans[(group, topic)] = plan_rebalance(topic_loads, n_consumers)
+            print_plan(group, topic, rows, weighted=bool(rates))
+
+        if plan_path:
+            write_plan(plan_path, plans)
+            print(f"Balanced assignment written to {plan_path}")
+
+    except FileNotFoundError:
+        print(f"Error: File '{file_path}' not found.")
+    except Exception as e:
+        print(f"An error occurred: {e}")
@@ -0,0 +1,365 @@
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from lag_tracker import read_partition_offsets
+
+# Offsets of "-" (no committed offset yet) are stored as this
+MISSING = -1
+# Lag results use this instead: a lag can be negative (the CLI briefly
+# reports one when the log end is read before the committed offset)
+UNKNOWN_LAG = np.iinfo(np.int64).min
+
+# Column files of the store, each a flat array of one dtype appended per
+# snapshot. Rows are one per partition, sorted by (group, topic, partition)
+# within a snapshot; the summary rows are one per (group, topic) pair.
+ROW_COLUMNS = {
+    "group": np.int32,
+    "topic": np.int32,
+    "partition": np.int32,
+    "current": np.int64,
+    "log_end": np.int64,
+}
+SUMMARY_COLUMNS = {
+    "summary_snapshot": np.int64,
+    "summary_group": np.int32,
+    "summary_topic": np.int32,
+    "summary_partitions": np.int64,
+    "summary_total": np.int64,
+    "summary_max": np.int64,
+}
+SNAPSHOT_COLUMNS = {
+    "timestamp": np.float64,
+    # Row and summary-row index at which each snapshot ends
+    "row_end": np.int64,
+    "summary_end": np.int64,
+}
+
+
+class LagStore:
+    """Consumer-lag snapshots in a directory of memory-mapped column files.
+
+    Group and topic names are dictionary-encoded (dictionary.json maps codes
+    to names) and offsets kept as int64, so a snapshot costs 28 bytes per
+    partition. At ingest each snapshot is also reduced to one summary row
+    per (group, topic) with its partition count, total and max lag, so
+    queries over long time ranges read a few summary rows per snapshot and
+    never touch the per-partition rows or the original text.
+
+    Snapshots are appended in time order. The snapshot columns are written
+    last, so rows left over from an interrupted ingest are ignored and then
+    overwritten by the next one.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        dictionary_path = os.path.join(path, "dictionary.json")
+        if os.path.exists(dictionary_path):
+            with open(dictionary_path) as f:
+                self.names = json.load(f)
+        else:
+            self.names = {"groups": [], "topics": []}
+        self.codes = {
+            kind: {name: code for code, name in enumerate(names)}
+            for kind, names in self.names.items()
+        }
+
+    def _file(self, column):
+        return os.path.join(self.path, f"{column}.bin")
+
+    def column(self, column, start=0, end=None):
+        """Memory-map rows [start, end) of a column file."""
+        dtype = {**ROW_COLUMNS, **SUMMARY_COLUMNS, **SNAPSHOT_COLUMNS}[column]
+        path = self._file(column)
+        length = os.path.getsize(path) // np.dtype(dtype).itemsize if os.path.exists(path) else 0
+        end = length if end is None else end
+        if end <= start:
+            return np.empty(0, dtype=dtype)
+        offset = start * np.dtype(dtype).itemsize
+        return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(end - start,))
+
+    def __len__(self):
+        # The snapshot columns are appended one after another, so a crash can
+        # leave them uneven; only snapshots present in all three count
+        return min(
+            os.path.getsize(self._file(column)) // 8 if os.path.exists(self._file(column)) else 0
+            for column in SNAPSHOT_COLUMNS
+        )
+
+    def _code(self, kind, name):
+        codes = self.codes[kind]
+        if name not in codes:
+            codes[name] = len(self.names[kind])
+            self.names[kind].append(name)
+        return codes[name]
+
+    def _append(self, columns):
+        for column, values in columns.items():
+            with open(self._file(column), "ab") as f:
+                f.write(np.ascontiguousarray(values).tobytes())
+
+    def _truncate(self, columns, length):
+        # Drop anything past the last committed snapshot
+        for column, dtype in columns.items():
+            path = self._file(column)
+            size = length * np.dtype(dtype).itemsize
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                os.truncate(path, size)
+
+    def ingest(self, file_path, timestamp=None):
+        """Append a describe snapshot; returns the number of partitions stored.
+
+        The timestamp defaults to the file's modification time, as with
+        `calculate_avg_lag.py --state`.
+        """
+        offsets = read_partition_offsets(file_path)
+        if offsets is None:
+            return None
+        if timestamp is None:
+            timestamp = os.path.getmtime(file_path)
+
+        n_snapshots = len(self)
+        if n_snapshots:
+            last = self.column("timestamp", n_snapshots - 1)[0]
+            if timestamp < last:
+                raise ValueError(
+                    f"snapshot at {timestamp} is older than the last one stored ({last})"
+                )
+        row_start = int(self.column("row_end", n_snapshots - 1)[0]) if n_snapshots else 0
+        summary_start = int(self.column("summary_end", n_snapshots - 1)[0]) if n_snapshots else 0
+        self._truncate(SNAPSHOT_COLUMNS, n_snapshots)
+        self._truncate(ROW_COLUMNS, row_start)
+        self._truncate(SUMMARY_COLUMNS, summary_start)
+
+        n = len(offsets)
+        group = np.empty(n, dtype=np.int32)
+        topic = np.empty(n, dtype=np.int32)
+        partition = np.empty(n, dtype=np.int32)
+        current = np.empty(n, dtype=np.int64)
+        log_end = np.empty(n, dtype=np.int64)
+        for i, ((g, t, p), (c, e)) in enumerate(offsets.items()):
+            group[i] = self._code("groups", g)
+            topic[i] = self._code("topics", t)
+            partition[i] = p
+            current[i] = MISSING if c is None else c
+            log_end[i] = MISSING if e is None else e
+
+        order = np.lexsort((partition, topic, group))
+        group, topic, partition = group[order], topic[order], partition[order]
+        current, log_end = current[order], log_end[order]
+        self._append(
+            {
+                "group": group,
+                "topic": topic,
+                "partition": partition,
+                "current": current,
+                "log_end": log_end,
+            }
+        )
+
+        # One summary row per (group, topic); rows are sorted, so each pair
+        # is a contiguous run and reduceat sums it exactly in int64
+        known = (current != MISSING) & (log_end != MISSING)
+        lag = np.where(known, log_end - current, 0)
+        if n:
+            pair = group.astype(np.int64) << 32 | topic
+            starts = np.flatnonzero(np.r_[True, pair[1:] != pair[:-1]])
+            max_lag = np.where(known, lag, UNKNOWN_LAG)
+            summary = {
+                "summary_snapshot": np.full(len(starts), n_snapshots, dtype=np.int64),
+                "summary_group": group[starts],
+                "summary_topic": topic[starts],
+                "summary_partitions": np.add.reduceat(known.astype(np.int64), starts),
+                "summary_total": np.add.reduceat(lag, starts),
+                "summary_max": np.maximum.reduceat(max_lag, starts),
+            }
+            self._append(summary)
+            n_summary = len(starts)
+        else:
+            n_summary = 0
+
+        self._save_dictionary()
+        # Committing the snapshot row makes the appended rows visible
+        self._append(
+            {
+                "timestamp": np.array([timestamp], dtype=np.float64),
+                "row_end": np.array([row_start + n], dtype=np.int64),
+                "summary_end": np.array([summary_start + n_summary], dtype=np.int64),
+            }
+        )
+        return n
+
+    def _save_dictionary(self):
+        # Write then rename, so a crash mid-write never leaves a corrupt dictionary
+        path = os.path.join(self.path, "dictionary.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.names, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def snapshot_range(self, start=None, end=None):
+        """Indices [first, last) of the snapshots with start <= timestamp <= end."""
+        timestamps = self.column("timestamp", 0, len(self))
+        first = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+        last = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side="right"))
+        return first, max(first, last)
+
+    def _filter_codes(self, topic, group):
+        # None means "any"; an unknown name matches nothing
+        return (
+            None if topic is None else self.codes["topics"].get(topic, -1),
+            None if group is None else self.codes["groups"].get(group, -1),
+        )
+
+    def lag_over_time(self, topic=None, group=None, start=None, end=None):
+        """Per-snapshot lag of a topic and/or group between two timestamps.
+
+        Returns (timestamps, partitions, total lag, max lag) arrays, one entry
+        per snapshot in range, summed over the (group, topic) pairs that match.
+        Only the summary columns are read.
+        """
+        first, last = self.snapshot_range(start, end)
+        timestamps = np.array(self.column("timestamp", first, last))
+        if first == last:
+            empty = np.zeros(0, dtype=np.int64)
+            return timestamps, empty, empty, empty
+
+        summary_end = self.column("summary_end", 0, last)
+        lo = int(summary_end[first - 1]) if first else 0
+        hi = int(summary_end[last - 1])
+
+        topic_code, group_code = self._filter_codes(topic, group)
+        mask = np.ones(hi - lo, dtype=bool)
+        if topic_code is not None:
+            mask &= self.column("summary_topic", lo, hi) == topic_code
+        if group_code is not None:
+            mask &= self.column("summary_group", lo, hi) == group_code
+
+        snapshot = self.column("summary_snapshot", lo, hi)[mask] - first
+        partitions = np.zeros(last - first, dtype=np.int64)
+        total = np.zeros(last - first, dtype=np.int64)
+        max_lag = np.full(last - first, UNKNOWN_LAG, dtype=np.int64)
+        np.add.at(partitions, snapshot, self.column("summary_partitions", lo, hi)[mask])
+        np.add.at(total, snapshot, self.column("summary_total", lo, hi)[mask])
+        np.maximum.at(max_lag, snapshot, self.column("summary_max", lo, hi)[mask])
+        return timestamps, partitions, total, max_lag
+
+    def partition_lag(self, topic, partition, group=None, start=None, end=None):
+        """(timestamps, groups, lag) of one partition; lag is UNKNOWN_LAG where it is unknown.
+
+        Without `group`, the partition's rows in every group that consumes
+        the topic are returned, and `groups` names the group of each row.
+        This reads the per-partition rows of the snapshots in range, so it
+        is slower than lag_over_time, but still never parses text.
+        """
+        first, last = self.snapshot_range(start, end)
+        row_end = self.column("row_end", 0, last)
+        lo = int(row_end[first - 1]) if first and last else 0
+        hi = int(row_end[last - 1]) if last else 0
+
+        topic_code, group_code = self._filter_codes(topic, group)
+        mask = (self.column("topic", lo, hi) == topic_code) & (
+            self.column("partition", lo, hi) == partition
+        )
+        if group_code is not None:
+            mask &= self.column("group", lo, hi) == group_code
+
+        rows = np.flatnonzero(mask)
+        # Row index -> snapshot index, from where each snapshot's rows end
+        snapshot = np.searchsorted(np.asarray(row_end[first:last]) - lo, rows, side="right")
+        current = self.column("current", lo, hi)[rows]
+        log_end = self.column("log_end", lo, hi)[rows]
+        known = (current != MISSING) & (log_end != MISSING)
+        lag = np.where(known, log_end - current, UNKNOWN_LAG)
+        timestamps = self.column("timestamp", first, last)[snapshot]
+        groups = [self.names["groups"][code] for code in self.column("group", lo, hi)[rows]]
+        return np.asarray(timestamps), groups, lag
+
+
+def parse_time(value):
+    """Epoch seconds or an ISO 8601 date/time (UTC unless it says otherwise)."""
+    try:
+        return float(value)
+    except ValueError:
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def print_lag_over_time(timestamps, partitions, total, max_lag):
+    print(
+        f"{'TIMESTAMP':<20} {'PARTITIONS':>10} {'TOTAL-LAG':>12} "
+        f"{'AVERAGE-LAG':>12} {'MAX-LAG':>10}"
+    )
+    for ts, n, t, m in zip(timestamps, partitions, total, max_lag):
+        average = f"{t / n:.2f}" if n else "-"
+        print(f"{format_time(ts):<20} {n:>10} {t:>12} {average:>12} {m if n else '-':>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Store consumer-lag snapshots in a compact columnar format and query them."
+    )
+    parser.add_argument("store", help="store directory (created if missing)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="append describe snapshots to the store")
+    ingest.add_argument("snapshots", nargs="+", help="snapshot files, oldest first")
+    ingest.add_argument(
+        "--timestamp",
+        type=parse_time,
+        help="timestamp of a single snapshot (default: the file's modification time)",
+    )
+
+    query = commands.add_parser("query", help="lag per snapshot over a time range")
+    query.add_argument("--topic")
+    query.add_argument("--group")
+    query.add_argument("--partition", type=int, help="one partition's lag (needs --topic)")
+    query.add_argument("--since", type=parse_time, help="epoch seconds or ISO date/time")
+    query.add_argument("--until", type=parse_time, help="epoch seconds or ISO date/time")
+    args = parser.parse_args()
+
+    store = LagStore(args.store)
+    if args.command == "ingest":
+        if args.timestamp is not None and len(args.snapshots) > 1:
+            parser.error("--timestamp applies to a single snapshot")
+        for path in args.snapshots:
+            try:
+                n = store.ingest(path, args.timestamp)
+            except FileNotFoundError:
+                sys.exit(f"Error: File '{path}' not found.")
+            except ValueError as e:
+                sys.exit(f"Error: {path}: {e}")
+            if n is not None:
+                print(f"{path}: {n} partitions")
+        sys.exit(0)
+
+    start = time.perf_counter()
+    if args.partition is not None:
+        if args.topic is None:
+            parser.error("--partition needs --topic")
+        timestamps, groups, lag = store.partition_lag(
+            args.topic, args.partition, args.group, args.since, args.until
+        )
+        elapsed = time.perf_counter() - start
+        width = max([len("GROUP"), *map(len, groups)])
+        print(f"{'TIMESTAMP':<20} {'GROUP':<{width}} {'LAG':>10}")
+        for ts, group, value in zip(timestamps, groups, lag):
+            value = value if value != UNKNOWN_LAG else "-"
+            print(f"{format_time(ts):<20} {group:<{width}} {value:>10}")
+    else:
+        result = store.lag_over_time(args.topic, args.group, args.since, args.until)
+        elapsed = time.perf_counter() - start
+        print_lag_over_time(*result)
+    print(f"Query took {elapsed * 1000:.1f} ms", file=sys.stderr)
@@ -0,0 +1,190 @@
+import json
+import os
+from collections import namedtuple
+
+from calculate_avg_lag import open_lag_reader
+
+PartitionDelta = namedtuple(
+    "PartitionDelta",
+    ["group", "topic", "partition", "lag", "lag_delta", "consume_rate", "produce_rate"],
+)
+
+
+def parse_offset(value):
+    # "-" means the group has no committed offset for the partition yet
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def read_partition_offsets(file_path, target_topic=None):
+    """Return {(group, topic, partition): (current_offset, log_end_offset)} for a snapshot."""
+    offsets = {}
+
+    with open(file_path, "r", newline="") as f:
+        rows, header, _ = open_lag_reader(f)
+
+        required = ("TOPIC", "PARTITION", "CURRENT-OFFSET", "LOG-END-OFFSET")
+        if not header or any(c not in header for c in required):
+            print(
+                f"Warning: Expected columns {', '.join(required)} not found. Found: {header}"
+            )
+            return None
+
+        topic_idx = header.index("TOPIC")
+        partition_idx = header.index("PARTITION")
+        current_idx = header.index("CURRENT-OFFSET")
+        end_idx = header.index("LOG-END-OFFSET")
+        group_idx = header.index("GROUP") if "GROUP" in header else None
+        width = max(topic_idx, partition_idx, current_idx, end_idx, group_idx or 0) + 1
+
+        for row in rows:
+            if len(row) < width:
+                continue
+
+            topic = row[topic_idx].strip()
+            if not topic or (target_topic is not None and topic != target_topic):
+                continue
+
+            try:
+                partition = int(row[partition_idx])
+            except ValueError:
+                # Repeated header or status line in CLI output
+                continue
+
+            group = row[group_idx].strip() if group_idx is not None else ""
+            offsets[(group, topic, partition)] = (
+                parse_offset(row[current_idx]),
+                parse_offset(row[end_idx]),
+            )
+
+    return offsets
+
+
+def load_index(state_path):
+    """Load the previous snapshot's offsets and timestamp, or (None, {}) if there is none.
+
+    The index is nested as group -> topic -> partition -> [current, log_end]
+    so each group and topic name is stored once.
+    """
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None, {}
+
+    offsets = {}
+    for group, topics in state["partitions"].items():
+        for topic, partitions in topics.items():
+            for partition, (current, log_end) in partitions.items():
+                offsets[(group, topic, int(partition))] = (current, log_end)
+    return state["timestamp"], offsets
+
+
+def save_index(state_path, timestamp, offsets):
+    partitions = {}
+    for (group, topic, partition), (current, log_end) in offsets.items():
+        partitions.setdefault(group, {}).setdefault(topic, {})[str(partition)] = [
+            current,
+            log_end,
+        ]
+
+    # Write then rename, so a crash mid-write never leaves a corrupt index
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"timestamp": timestamp, "partitions": partitions}, f, separators=(",", ":"))
+    os.replace(tmp_path, state_path)
+
+
+def diff_offsets(previous, current, elapsed):
+    """Compare two snapshots' offsets, `elapsed` seconds apart.
+
+    Rates and deltas are None when either side is unknown, e.g. for new
+    partitions or partitions without a committed offset.
+    """
+    deltas = []
+    for key, (offset, log_end) in current.items():
+        prev_offset, prev_log_end = previous.get(key, (None, None))
+        lag = log_end - offset if offset is not None and log_end is not None else None
+        prev_lag = (
+            prev_log_end - prev_offset
+            if prev_offset is not None and prev_log_end is not None
+            else None
+        )
+
+        consume_rate = produce_rate = None
+        if elapsed and elapsed > 0:
+            if offset is not None and prev_offset is not None:
+                consume_rate = (offset - prev_offset) / elapsed
+            if log_end is not None and prev_log_end is not None:
+                produce_rate = (log_end - prev_log_end) / elapsed
+
+        deltas.append(
+            PartitionDelta(
+                *key,
+                lag=lag,
+                lag_delta=lag - prev_lag if lag is not None and prev_lag is not None else None,
+                consume_rate=consume_rate,
+                produce_rate=produce_rate,
+            )
+        )
+    return deltas
+
+
+def track_lag(file_path, state_path, target_topic=None):
+    """Diff the snapshot at `file_path` against the index at `state_path`, then update the index.
+
+    The snapshot's modification time is used as its timestamp. Only the
+    index is read back, never the previous snapshot file.
+    """
+    current = read_partition_offsets(file_path, target_topic)
+    if current is None:
+        return None
+
+    timestamp = os.path.getmtime(file_path)
+    prev_timestamp, previous = load_index(state_path)
+    elapsed = timestamp - prev_timestamp if prev_timestamp is not None else None
+
+    deltas = diff_offsets(previous, current, elapsed)
+
+    # Keep partitions not in this snapshot (e.g. a run filtered to one topic)
+    previous.update(current)
+    save_index(state_path, timestamp, previous)
+
+    return deltas
+
+
+def _fmt(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def print_lag_deltas(deltas):
+    print(
+        f"{'GROUP':<24} {'TOPIC':<24} {'PARTITION':>9} {'LAG':>10} "
+        f"{'LAG-DELTA':>10} {'CONSUME/s':>12} {'PRODUCE/s':>12}"
+    )
+    for d in sorted(deltas, key=lambda d: (d.group, d.topic, d.partition)):
+        print(
+            f"{d.group:<24} {d.topic:<24} {d.partition:>9} {_fmt(d.lag, 'd'):>10} "
+            f"{_fmt(d.lag_delta, '+d'):>10} {_fmt(d.consume_rate, '.2f'):>12} "
+            f"{_fmt(d.produce_rate, '.2f'):>12}"
+        )
+
+
+def report_lag_trend(file_path, state_path, target_topic=None):
+    try:
+        deltas = track_lag(file_path, state_path, target_topic)
+        if deltas is None:
+            return
+
+        if not deltas:
+            print("No partitions found")
+            return
+
+        print_lag_deltas(deltas)
+
+    except FileNotFoundError:
+        print(f"Error: File '{file_path}' not found.")
+    except Exception as e:
+        print(f"An error occurred: {e}")
@@ -0,0 +1,222 @@
+import argparse
+import csv
+import os
+import random
+import sys
+
+from calculate_avg_lag import aggregate_lag
+
+GROUP = "demo-consumer-group"
+SNAPSHOT_HEADER = ["GROUP", "TOPIC", "PARTITION", "CURRENT-OFFSET", "LOG-END-OFFSET", "LAG"]
+SUMMARY_HEADER = [
+    "PARTITIONS",
+    "CONSUMERS",
+    "PRODUCED",
+    "CONSUMED",
+    "THROUGHPUT",
+    "TOTAL-LAG",
+    "AVERAGE-LAG",
+]
+
+
+class SimulatedTopic:
+    """In-process stand-in for a partitioned Kafka topic and one consumer group.
+
+    Producers append at `produce_rate` msgs/s, slowed by a per-partition
+    broker overhead, and each consumer drains the partitions assigned to
+    it at up to `consume_rate` msgs/s. A consumer can only read its own
+    partitions, so consumers beyond the partition count sit idle.
+    """
+
+    def __init__(
+        self,
+        name,
+        partitions,
+        consumers,
+        produce_rate=5000,
+        consume_rate=400,
+        partition_overhead=0.0002,
+        seed=0,
+    ):
+        self.name = name
+        self.partitions = partitions
+        self.produce_rate = produce_rate / (1 + partition_overhead * partitions)
+        self.consume_rate = consume_rate
+        self.rng = random.Random(seed)
+
+        self.log_end = [0] * partitions
+        self.committed = [0] * partitions
+
+        # Round-robin assignment, as Kafka's RoundRobinAssignor would do
+        active = min(consumers, partitions)
+        self.assignment = [list(range(c, partitions, active)) for c in range(active)]
+
+        # Fractional messages carried over between ticks
+        self._produce_carry = 0.0
+        self._consume_carry = 0.0
+
+    def produce(self, dt):
+        budget = self.produce_rate * dt + self._produce_carry
+        n = int(budget)
+        self._produce_carry = budget - n
+
+        base, extra = divmod(n, self.partitions)
+        if base:
+            for p in range(self.partitions):
+                self.log_end[p] += base
+        for p in self.rng.sample(range(self.partitions), extra):
+            self.log_end[p] += 1
+
+    def consume(self, dt):
+        budget = self.consume_rate * dt + self._consume_carry
+        n = int(budget)
+        self._consume_carry = budget - n
+
+        for owned in self.assignment:
+            remaining = n
+            # Spread the consumer's budget over its lagging partitions
+            lagging = [p for p in owned if self.log_end[p] > self.committed[p]]
+            while remaining and lagging:
+                share = max(1, remaining // len(lagging))
+                still_lagging = []
+                for p in lagging:
+                    take = min(share, remaining, self.log_end[p] - self.committed[p])
+                    self.committed[p] += take
+                    remaining -= take
+                    if self.log_end[p] > self.committed[p]:
+                        still_lagging.append(p)
+                    if not remaining:
+                        break
+                lagging = still_lagging
+
+    def run(self, duration, dt=0.1):
+        for _ in range(round(duration / dt)):
+            self.produce(dt)
+            self.consume(dt)
+
+    def snapshot_rows(self):
+        for p in range(self.partitions):
+            yield [
+                GROUP,
+                self.name,
+                p,
+                self.committed[p],
+                self.log_end[p],
+                self.log_end[p] - self.committed[p],
+            ]
+
+
+def write_snapshot(path, topics):
+    """Write `topics` in the results.csv schema."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(SNAPSHOT_HEADER)
+        for topic in topics:
+            writer.writerows(topic.snapshot_rows())
+
+
+def run_sweep(partition_counts, consumer_counts, out_dir, duration=10.0, seed=0, **rates):
+    """Simulate every (partitions, consumers) pair and summarise its lag.
+
+    Each run's snapshot is written to `out_dir` and read back through
+    `aggregate_lag`, exactly as a hand-collected results.csv would be.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    summary = []
+    for partitions in partition_counts:
+        for consumers in consumer_counts:
+            topic = SimulatedTopic(
+                f"topic-{partitions}", partitions, consumers, seed=seed, **rates
+            )
+            topic.run(duration)
+
+            path = os.path.join(out_dir, f"topic-{partitions}-consumers-{consumers}.csv")
+            write_snapshot(path, [topic])
+            stats = aggregate_lag(path, topic.name)[(GROUP, topic.name)]
+
+            produced = sum(topic.log_end)
+            consumed = sum(topic.committed)
+            summary.append(
+                [
+                    partitions,
+                    consumers,
+                    produced,
+                    consumed,
+                    f"{consumed / duration:.2f}",
+                    stats.total,
+                    f"{stats.mean:.2f}",
+                ]
+            )
+    return summary
+
+
+def write_summary(path, summary):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(SUMMARY_HEADER)
+        writer.writerows(summary)
+
+
+def check_against_baseline(summary, baseline_path, tolerance=0.05):
+    """Return a list of regressions where throughput or lag moved more than `tolerance`."""
+    with open(baseline_path, newline="") as f:
+        baseline = {
+            (int(row["PARTITIONS"]), int(row["CONSUMERS"])): row
+            for row in csv.DictReader(f)
+        }
+
+    failures = []
+    for row in summary:
+        current = dict(zip(SUMMARY_HEADER, row))
+        key = (int(current["PARTITIONS"]), int(current["CONSUMERS"]))
+        expected = baseline.get(key)
+        if expected is None:
+            failures.append(f"{key}: missing from baseline")
+            continue
+        for column in ("THROUGHPUT", "AVERAGE-LAG"):
+            got, want = float(current[column]), float(expected[column])
+            if abs(got - want) > tolerance * max(abs(want), 1.0):
+                failures.append(f"{key}: {column} {got} vs baseline {want}")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Sweep partition and consumer counts against a simulated Kafka topic."
+    )
+    parser.add_argument("--partitions", type=int, nargs="+", default=[1, 10, 1000])
+    parser.add_argument("--consumers", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--duration", type=float, default=10.0, help="simulated seconds")
+    parser.add_argument("--produce-rate", type=float, default=5000, help="msgs/s")
+    parser.add_argument("--consume-rate", type=float, default=400, help="msgs/s per consumer")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="benchmark-results", help="output directory")
+    parser.add_argument(
+        "--check",
+        metavar="BASELINE",
+        help="fail if throughput or average lag drifts from this summary CSV, e.g. benchmark_baseline.csv",
+    )
+    args = parser.parse_args()
+
+    summary = run_sweep(
+        args.partitions,
+        args.consumers,
+        args.out,
+        duration=args.duration,
+        seed=args.seed,
+        produce_rate=args.produce_rate,
+        consume_rate=args.consume_rate,
+    )
+    summary_path = os.path.join(args.out, "throughput.csv")
+    write_summary(summary_path, summary)
+
+    print(f"{'Partitions':>10} {'Consumers':>10} {'Throughput':>12} {'Average Lag':>12}")
+    for partitions, consumers, _, _, throughput, _, avg_lag in summary:
+        print(f"{partitions:>10} {consumers:>10} {throughput:>12} {avg_lag:>12}")
+    print(f"Summary written to {summary_path}")
+
+    if args.check:
+        failures = check_against_baseline(summary, args.check)
+        for failure in failures:
+            print(f"Regression: {failure}")
+        sys.exit(1 if failures else 0)
@@ -0,0 +1,122 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from linear_regression import (
+    SALARY_CSV,
+    fit_gradient_descent,
+    fit_lstsq,
+    fit_sufficient_statistics,
+    load_salary,
+)
+
+
+def fit_naive(X, y, alpha, n_iterations):
+    """The original training loop, kept as the baseline to compare against."""
+    theta_0 = 0.0
+    theta_1 = 0.0
+    m = len(X)
+    losses = []
+    for i in range(n_iterations):
+        y_pred = theta_0 + theta_1 * X
+        loss = (1 / m) * np.sum((y - y_pred) ** 2)
+        losses.append(loss)
+        d_theta_0 = (-2 / m) * np.sum(y - y_pred)
+        d_theta_1 = (-2 / m) * np.sum((y - y_pred) * X)
+        theta_0 = theta_0 - alpha * d_theta_0
+        theta_1 = theta_1 - alpha * d_theta_1
+    return theta_0, theta_1
+
+
+def synthetic_dataset(m, n_features=1, seed=0):
+    """y = 3 + 2 * sum(X) plus noise, with X uniform on [0, 10)."""
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 10, size=(m, n_features))
+    y = 3 + 2 * X.sum(axis=1) + rng.normal(0, 1, size=m)
+    return (X[:, 0] if n_features == 1 else X), y
+
+
+def time_it(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def report(name, X, y, alpha, n_iterations, tol):
+    result, elapsed = time_it(lambda: fit_gradient_descent(X, y, alpha, n_iterations, tol))
+    theta = ", ".join(f"{t:.3f}" for t in result.theta)
+    print(
+        f"{name:<28} {len(y):>10} {result.iterations:>10} {elapsed:>10.3f}  "
+        f"converged={result.converged} theta=[{theta}]"
+    )
+
+    if np.ndim(X) == 1:
+        _, naive = time_it(lambda: fit_naive(X, y, alpha, result.iterations))
+        print(f"{'  original loop':<28} {len(y):>10} {result.iterations:>10} {naive:>10.3f}")
+
+
+def compare_solvers(name, X, y, csv_path, gd_alpha, rtol=1e-6, max_iterations=100_000):
+    """Time each solver and report how close its final MSE is to the optimum."""
+    optimum = fit_lstsq(X, y).losses[-1]
+    solvers = [
+        ("lstsq", lambda: fit_lstsq(X, y)),
+        ("stats (streamed CSV)", lambda: fit_sufficient_statistics(csv_path)),
+        (
+            "gd",
+            lambda: fit_gradient_descent(X, y, gd_alpha, max_iterations, tol=1e-12),
+        ),
+        (
+            "gd, standardized",
+            lambda: fit_gradient_descent(
+                X, y, 0.1, max_iterations, tol=1e-12, standardize=True
+            ),
+        ),
+    ]
+
+    print(f"\n{name}: {len(y)} rows, target relative MSE gap {rtol:g}")
+    print(f"{'Solver':<24} {'Iters':>8} {'Seconds':>10} {'MSE gap':>12}  Reached")
+    for solver, fit in solvers:
+        result, elapsed = time_it(fit)
+        # For gradient descent the last recorded loss is one step behind theta
+        gap = (result.losses[-1] - optimum) / optimum
+        print(
+            f"{solver:<24} {result.iterations:>8} {elapsed:>10.3f} {gap:>12.2e}  "
+            f"{'yes' if gap <= rtol else 'no'}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time gradient descent to convergence.")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--tol", type=float, default=1e-9)
+    parser.add_argument(
+        "--solvers",
+        action="store_true",
+        help="compare time-to-accuracy of every solver instead",
+    )
+    args = parser.parse_args()
+
+    if args.solvers:
+        X, y = load_salary()
+        compare_solvers("salary.csv", X, y, SALARY_CSV, gd_alpha=0.0001)
+
+        X, y = synthetic_dataset(args.rows)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "synthetic.csv")
+            pd.DataFrame({"YearsExperience": X, "Salary": y}).to_csv(path, index=False)
+            compare_solvers("synthetic", X, y, path, gd_alpha=0.01)
+    else:
+        print(f"{'Dataset':<28} {'Rows':>10} {'Iters':>10} {'Seconds':>10}")
+
+        X, y = load_salary()
+        report("salary.csv", X, y, alpha=0.0001, n_iterations=100_000, tol=args.tol)
+
+        X, y = synthetic_dataset(args.rows)
+        report("synthetic, 1 feature", X, y, alpha=0.01, n_iterations=10_000, tol=args.tol)
+
+        X, y = synthetic_dataset(args.rows, n_features=4)
+        report("synthetic, 4 features", X, y, alpha=0.005, n_iterations=2_000, tol=args.tol)
@@ -0,0 +1,58 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from linear_regression import SALARY_CSV, fit_gradient_descent, load_salary, plot_results
+from plot_salary import plot_salary
+
+POST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _use_agg():
+    # Runs in each worker before pyplot is imported, so no GUI toolkit is loaded
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _render(plot, args, path):
+    start = time.perf_counter()
+    plot(*args, path=path, show=False)
+    return path, time.perf_counter() - start
+
+
+def export_plots(csv_file=SALARY_CSV, out_dir=POST_DIR, workers=None):
+    """Regenerate the post's PNGs headlessly, one figure per worker process.
+
+    The model is fitted once here; workers only render.
+    """
+    X, y = load_salary(csv_file)
+    result = fit_gradient_descent(X, y)
+
+    jobs = [
+        (plot_salary, (X, y), "salary_plot.png"),
+        (plot_results, (X, y, result), "linear_regression_results.png"),
+    ]
+    os.makedirs(out_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_use_agg) as pool:
+        futures = [
+            pool.submit(_render, plot, args, os.path.join(out_dir, name))
+            for plot, args, name in jobs
+        ]
+        return [future.result() for future in futures]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Render the linear regression post's figures without a display."
+    )
+    parser.add_argument("csv_file", nargs="?", default=SALARY_CSV)
+    parser.add_argument("--out", default=POST_DIR, help="output directory")
+    parser.add_argument("--workers", type=int, help="render processes (default: CPU count)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    for path, elapsed in export_plots(args.csv_file, args.out, args.workers):
+        print(f"{path} ({elapsed * 1000:.0f} ms)")
+    print(f"Exported in {time.perf_counter() - start:.2f} s")
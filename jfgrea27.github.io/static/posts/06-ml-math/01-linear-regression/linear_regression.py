@@ -1,66 +1,649 @@
-import matplotlib.pyplot as plt
+import argparse
+import os
+import time
+from collections import namedtuple
+
 import numpy as np
-import pandas as pd
 
-# Read the salary dataset
-df = pd.read_csv("path/to/06-ml-math/01-linear-regression/salary.csv")
+SALARY_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "salary.csv")
 
-X = df["YearsExperience"].to_numpy()
-y = df["Salary"].to_numpy()
+# Index matrix entries per bootstrap chunk, ~32 MB of int64 indices
+BOOTSTRAP_CHUNK_ENTRIES = 4_000_000
 
-# Initialize parameters
-theta_0 = 0.0  # y-intercept
-theta_1 = 0.0  # gradient
-alpha = 0.0001  # learning rate (small due to large salary values)
-n_iterations = 1000
-m = len(X)
+# loss_steps holds the iteration of each recorded loss, when not every iteration is recorded
+FitResult = namedtuple(
+    "FitResult", ["theta", "losses", "iterations", "converged", "loss_steps"], defaults=[None]
+)
 
-# Store loss history
-losses = []
 
-# Gradient descent
-for i in range(n_iterations):
-    # Predictions
-    y_pred = theta_0 + theta_1 * X
+def load_salary(path=SALARY_CSV):
+    # Read the salary dataset with numpy's parser, so a fit doesn't pay
+    # for importing pandas
+    with open(path) as f:
+        header = f.readline().rstrip("\r\n").split(",")
+        columns = (header.index("YearsExperience"), header.index("Salary"))
+        X, y = np.loadtxt(f, delimiter=",", usecols=columns, unpack=True, ndmin=2)
+    return X, y
+
+
+def as_matrix(X):
+    X = np.asarray(X, dtype=np.float64)
+    return X[:, np.newaxis] if X.ndim == 1 else X
+
+
+class LossHistory:
+    """Training-loss recorder that keeps every `every`-th loss.
+
+    `every=0` records nothing. With `ring_size`, only the latest
+    `ring_size` recorded losses are kept in a preallocated ring buffer, so
+    memory stays constant however long training runs.
+    """
+
+    def __init__(self, n_iterations, every=1, ring_size=None):
+        self.every = every
+        self.ring = ring_size is not None
+        if not every:
+            capacity = 0
+        elif self.ring:
+            capacity = ring_size
+        else:
+            capacity = -(-n_iterations // every)
+        self.losses = np.empty(capacity)
+        self.steps = np.empty(capacity, dtype=np.int64)
+        self.count = 0
+
+    def wants(self, i):
+        return bool(self.every) and i % self.every == 0
+
+    def record(self, i, loss):
+        if not len(self.losses):
+            return
+        j = self.count % len(self.losses)
+        self.losses[j] = loss
+        self.steps[j] = i
+        self.count += 1
+
+    def arrays(self):
+        """Return the recorded (losses, steps) in chronological order."""
+        if self.count <= len(self.losses):
+            return self.losses[: self.count], self.steps[: self.count]
+        start = self.count % len(self.losses)
+        order = np.r_[start : len(self.losses), 0:start]
+        return self.losses[order], self.steps[order]
 
-    # Calculate MSE loss
-    loss = (1 / m) * np.sum((y - y_pred) ** 2)
-    losses.append(loss)
+
+def mse_gradient(X, y, theta, residual, grad, compute_loss=True):
+    """Write the MSE gradient at `theta` into `grad` and return the MSE loss.
+
+    `residual` is a preallocated buffer of len(y); the loss and both
+    gradients are reductions over it, so nothing is allocated here. With
+    `compute_loss=False` the loss reduction is skipped and None returned.
+    """
+    m = len(y)
+
+    # Residual y - (theta_0 + X @ theta_1..n), computed in place
+    np.dot(X, theta[1:], out=residual)
+    residual += theta[0]
+    np.subtract(y, residual, out=residual)
 
     # Calculate gradients
-    d_theta_0 = (-2 / m) * np.sum(y - y_pred)
-    d_theta_1 = (-2 / m) * np.sum((y - y_pred) * X)
-
-    # Update parameters
-    theta_0 = theta_0 - alpha * d_theta_0
-    theta_1 = theta_1 - alpha * d_theta_1
-
-print(f"Final parameters:")
-print(f"  theta_0 (y-intercept): {theta_0:.2f}")
-print(f"  theta_1 (gradient): {theta_1:.2f}")
-print(f"  Equation: Salary = {theta_0:.2f} + {theta_1:.2f} * YearsExperience")
-
-# Create two subplots
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
-
-# Plot 1: Data points and line of best fit
-ax1.scatter(X, y, color="blue", alpha=0.7, label="Data points")
-X_line = np.linspace(X.min(), X.max(), 100)
-y_line = theta_0 + theta_1 * X_line
-ax1.plot(X_line, y_line, color="red", linewidth=2, label="Line of best fit")
-ax1.set_xlabel("Years of Experience")
-ax1.set_ylabel("Salary ($)")
-ax1.set_title("Linear Regression: Salary vs Experience")
-ax1.legend()
-ax1.grid(True, alpha=0.3)
-
-# Plot 2: Loss over iterations
-ax2.plot(range(n_iterations), losses, color="green", linewidth=2)
-ax2.set_xlabel("Iteration")
-ax2.set_ylabel("MSE Loss")
-ax2.set_title("Loss over Training Iterations")
-ax2.grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig("linear_regression_results.png")
-plt.show()
+    grad[0] = residual.sum()
+    np.dot(residual, X, out=grad[1:])
+    grad *= -2 / m
+
+    # Calculate MSE loss
+    if not compute_loss:
+        return None
+    return np.dot(residual, residual) / m
+
+
+def fit_gradient_descent(
+    X,
+    y,
+    alpha=0.0001,
+    n_iterations=1000,
+    tol=None,
+    theta=None,
+    standardize=False,
+    record_every=1,
+    ring_size=None,
+):
+    """Fit y = theta[0] + X @ theta[1:] by batch gradient descent on the MSE.
+
+    X may be a vector (one feature) or an (m, n) matrix. The residual is
+    written into a preallocated buffer each iteration, and the loss and both
+    gradients are reductions over that one buffer, so no per-iteration
+    arrays are allocated.
+
+    The loss is only evaluated on iterations that record it (every
+    `record_every`-th, see LossHistory), saving a reduction over the data
+    on every other step. If `tol` is given, training stops once the loss
+    improves by less than `tol` relative to the previous evaluation, or
+    starts rising; with recording off the loss is then evaluated every
+    iteration but not stored.
+
+    With `standardize`, each feature is scaled to zero mean and unit
+    variance before training and theta is mapped back to the original
+    units afterwards. The loss surface is then well conditioned, so a
+    learning rate around 0.1 works whatever the feature scale.
+    """
+    X = as_matrix(X)
+    y = np.asarray(y, dtype=np.float64)
+    m, n = X.shape
+
+    if standardize:
+        mean = X.mean(axis=0)
+        std = X.std(axis=0)
+        std[std == 0] = 1.0
+        if theta is not None:
+            theta = np.asarray(theta, dtype=np.float64)
+            theta = np.concatenate([[theta[0] + theta[1:] @ mean], theta[1:] * std])
+
+        result = fit_gradient_descent(
+            (X - mean) / std,
+            y,
+            alpha,
+            n_iterations,
+            tol,
+            theta,
+            record_every=record_every,
+            ring_size=ring_size,
+        )
+        weights = result.theta[1:] / std
+        return result._replace(
+            theta=np.concatenate([[result.theta[0] - weights @ mean], weights])
+        )
+
+    # Initialize parameters: theta[0] is the y-intercept, theta[1:] the gradients
+    theta = np.zeros(n + 1) if theta is None else np.array(theta, dtype=np.float64)
+
+    # Preallocated buffers reused by every iteration
+    residual = np.empty(m)
+    grad = np.empty(n + 1)
+
+    # Store loss history
+    history = LossHistory(n_iterations, record_every, ring_size)
+    check_every = record_every or (1 if tol is not None else 0)
+    previous_loss = None
+    converged = False
+    iterations = 0
+
+    # Gradient descent
+    for i in range(n_iterations):
+        iterations = i + 1
+        evaluate = bool(check_every) and i % check_every == 0
+        loss = mse_gradient(X, y, theta, residual, grad, compute_loss=evaluate)
+        if history.wants(i):
+            history.record(i, loss)
+
+        # Update parameters
+        theta -= alpha * grad
+
+        if tol is not None and evaluate:
+            if previous_loss is not None:
+                improvement = previous_loss - loss
+                # A rising loss means alpha is too large: stop, but not as converged
+                if improvement <= tol * previous_loss:
+                    converged = improvement >= 0
+                    break
+            previous_loss = loss
+
+    losses, steps = history.arrays()
+    return FitResult(theta, losses, iterations, converged, steps)
+
+
+def fit_lstsq(X, y):
+    """Solve the normal equations directly, via numpy's SVD-based least squares.
+
+    Exact in one step and independent of feature scale; the right choice
+    whenever the design matrix fits in memory.
+    """
+    X = as_matrix(X)
+    y = np.asarray(y, dtype=np.float64)
+    design = np.column_stack([np.ones(len(y)), X])
+
+    theta, *_ = np.linalg.lstsq(design, y, rcond=None)
+    residual = y - design @ theta
+    loss = np.dot(residual, residual) / len(y)
+    return FitResult(theta, np.array([loss]), 1, True)
+
+
+def fit_sufficient_statistics(
+    path, x_columns=("YearsExperience",), y_column="Salary", chunk_size=100_000
+):
+    """Solve the normal equations from X^T X and X^T y, accumulated in one streaming pass.
+
+    Memory is O(n^2) in the number of features however many rows `path`
+    has. The MSE is recovered from the same statistics, with no second pass.
+    """
+    import pandas as pd
+
+    n = len(x_columns) + 1
+    xtx = np.zeros((n, n))
+    xty = np.zeros(n)
+    yty = 0.0
+    m = 0
+
+    for df in pd.read_csv(path, usecols=[*x_columns, y_column], chunksize=chunk_size):
+        design = np.column_stack(
+            [np.ones(len(df)), df[list(x_columns)].to_numpy(dtype=np.float64)]
+        )
+        y = df[y_column].to_numpy(dtype=np.float64)
+        xtx += design.T @ design
+        xty += design.T @ y
+        yty += np.dot(y, y)
+        m += len(y)
+
+    theta, *_ = np.linalg.lstsq(xtx, xty, rcond=None)
+    # ||y - X theta||^2 = y^T y - 2 theta^T X^T y + theta^T X^T X theta
+    loss = (yty - 2 * theta @ xty + theta @ xtx @ theta) / m
+    return FitResult(theta, np.array([loss]), 1, True)
+
+
+def bootstrap_chunk(X, y, n_resamples, seed):
+    """Least-squares fits of `n_resamples` bootstrap resamples, as an (n_resamples, n+1) array.
+
+    The resamples are drawn as one (n_resamples, m) index matrix and turned
+    into per-row counts, so each resample's X^T X and X^T y is one matrix
+    product of the counts with the rows' outer products; all the normal
+    equations are then solved in a single batched call.
+    """
+    X = as_matrix(X)
+    y = np.asarray(y, dtype=np.float64)
+    m = len(y)
+    design = np.column_stack([np.ones(m), X])
+    n = design.shape[1]
+
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, m, size=(n_resamples, m))
+    offsets = (np.arange(n_resamples) * m)[:, np.newaxis]
+    counts = np.bincount((indices + offsets).ravel(), minlength=n_resamples * m)
+    counts = counts.reshape(n_resamples, m).astype(np.float64)
+
+    outer = (design[:, :, np.newaxis] * design[:, np.newaxis, :]).reshape(m, n * n)
+    xtx = (counts @ outer).reshape(n_resamples, n, n)
+    xty = counts @ (design * y[:, np.newaxis])
+    # pinv rather than solve: a resample that drew a single x value is singular
+    return (np.linalg.pinv(xtx) @ xty[:, :, np.newaxis])[:, :, 0]
+
+
+def bootstrap(X, y, n_resamples=2000, confidence=0.95, seed=0, chunk_size=None, workers=None):
+    """Bootstrap the least-squares parameters.
+
+    Returns (thetas, intervals): the (n_resamples, n+1) fitted parameters
+    and the (n+1, 2) percentile confidence intervals. Resamples are fitted
+    `chunk_size` at a time (by default, as many as keep the index matrix to
+    a few million entries), and the chunks go to `workers` processes if
+    given. Each chunk has its own seed from `seed`, so the result doesn't
+    depend on the number of workers.
+    """
+    if chunk_size is None:
+        chunk_size = max(1, BOOTSTRAP_CHUNK_ENTRIES // len(y))
+    sizes = [
+        min(chunk_size, n_resamples - start) for start in range(0, n_resamples, chunk_size)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(bootstrap_chunk, X, y, size, chunk_seed)
+                for size, chunk_seed in zip(sizes, seeds)
+            ]
+            chunks = [future.result() for future in futures]
+    else:
+        chunks = [
+            bootstrap_chunk(X, y, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)
+        ]
+    thetas = np.concatenate(chunks)
+
+    tail = (1 - confidence) / 2
+    intervals = np.quantile(thetas, [tail, 1 - tail], axis=0).T
+    return thetas, intervals
+
+
+def confidence_band(thetas, X_line, confidence=0.95):
+    """Pointwise percentile band of the bootstrapped lines over `X_line`."""
+    predictions = thetas[:, :1] + thetas[:, 1:2] * X_line
+    tail = (1 - confidence) / 2
+    return np.quantile(predictions, [tail, 1 - tail], axis=0)
+
+
+def index_chunks(path, chunk_size):
+    """Return the CSV header and the byte offset of every `chunk_size`-row chunk.
+
+    Only one offset per chunk is kept, so chunks can later be read back in
+    any order without holding the file in memory.
+    """
+    offsets = []
+    with open(path, "rb") as f:
+        header = f.readline().decode("utf-8").rstrip("\r\n").split(",")
+        offset = f.tell()
+        for row, line in enumerate(f):
+            if row % chunk_size == 0:
+                offsets.append(offset)
+            offset += len(line)
+    return header, offsets
+
+
+def fit_sgd_streaming(
+    path,
+    x_columns=("YearsExperience",),
+    y_column="Salary",
+    alpha=0.0001,
+    batch_size=1024,
+    epochs=10,
+    tol=None,
+    shuffle=True,
+    seed=0,
+):
+    """Fit by mini-batch gradient descent, streaming `path` one batch at a time.
+
+    Theta is updated once per batch. With `shuffle`, the order of the
+    batches is permuted every epoch; the rows within a batch need no
+    shuffling, as each batch's gradient is a sum over all of them. Only
+    one batch is in memory at a time, so datasets larger than RAM can be
+    fitted. The returned losses are the mean batch loss of each epoch.
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    header, offsets = index_chunks(path, batch_size)
+
+    theta = np.zeros(len(x_columns) + 1)
+    grad = np.empty_like(theta)
+    residual = np.empty(batch_size)
+
+    losses = np.empty(epochs)
+    converged = False
+    epochs_run = 0
+    if not offsets:
+        # No data rows, so nothing to fit
+        return FitResult(theta, losses[:0], epochs_run, converged)
+
+    with open(path, "rb") as f:
+        for epoch in range(epochs):
+            epochs_run = epoch + 1
+            order = rng.permutation(len(offsets)) if shuffle else range(len(offsets))
+            total_loss = 0.0
+            rows = 0
+            for chunk in order:
+                f.seek(offsets[chunk])
+                df = pd.read_csv(f, header=None, names=header, nrows=batch_size)
+                X = df[list(x_columns)].to_numpy(dtype=np.float64)
+                y = df[y_column].to_numpy(dtype=np.float64)
+
+                loss = mse_gradient(X, y, theta, residual[: len(y)], grad)
+                theta -= alpha * grad
+
+                total_loss += loss * len(y)
+                rows += len(y)
+
+            losses[epoch] = total_loss / rows
+            if (
+                tol is not None
+                and epoch > 0
+                and abs(losses[epoch - 1] - losses[epoch]) <= tol * losses[epoch - 1]
+            ):
+                converged = True
+                break
+
+    return FitResult(theta, losses[:epochs_run], epochs_run, converged)
+
+
+def plot_results(
+    X,
+    y,
+    result,
+    path="linear_regression_results.png",
+    show=True,
+    density="auto",
+    thetas=None,
+    confidence=0.95,
+    band_theta=None,
+):
+    """Plot the data with the fitted line, and the loss curve if one was recorded.
+
+    `thetas` are bootstrap fits (see bootstrap) drawn as a confidence band.
+    The band is for the least-squares estimate `band_theta`, which is also
+    drawn when it differs from `result.theta`, e.g. an unconverged
+    gradient-descent fit.
+    """
+    import matplotlib.pyplot as plt
+
+    from plot_salary import plot_points
+
+    theta_0, theta_1 = result.theta[0], result.theta[1]
+
+    # Create two subplots, or one if no losses were recorded
+    if len(result.losses):
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+    else:
+        fig, ax1 = plt.subplots(figsize=(7, 5))
+
+    # Plot 1: Data points and line of best fit
+    plot_points(ax1, X, y, density, color="blue", alpha=0.7, label="Data points")
+    X_line = np.linspace(X.min(), X.max(), 100)
+    y_line = theta_0 + theta_1 * X_line
+    ax1.plot(X_line, y_line, color="red", linewidth=2, label="Line of best fit")
+    if band_theta is not None and not np.allclose(band_theta, result.theta):
+        ax1.plot(
+            X_line,
+            band_theta[0] + band_theta[1] * X_line,
+            color="darkred",
+            linestyle="--",
+            linewidth=2,
+            label="Least squares",
+        )
+    if thetas is not None:
+        lower, upper = confidence_band(thetas, X_line, confidence)
+        ax1.fill_between(
+            X_line,
+            lower,
+            upper,
+            color="red",
+            alpha=0.2,
+            label=f"{confidence:.0%} bootstrap band (least squares)",
+        )
+    ax1.set_xlabel("Years of Experience")
+    ax1.set_ylabel("Salary ($)")
+    ax1.set_title("Linear Regression: Salary vs Experience")
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+
+    # Plot 2: Loss over iterations, at the iterations it was recorded on
+    if len(result.losses):
+        steps = result.loss_steps
+        if steps is None:
+            steps = np.arange(len(result.losses))
+        ax2.plot(steps, result.losses, color="green", linewidth=2)
+        ax2.set_xlabel("Iteration")
+        ax2.set_ylabel("MSE Loss")
+        ax2.set_title("Loss over Training Iterations")
+        ax2.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(path)
+    if show:
+        plt.show()
+    plt.close(fig)
+
+
+def main(argv=None, prog=None, plot=True):
+    parser = argparse.ArgumentParser(
+        prog=prog, description="Fit salary vs experience by gradient descent."
+    )
+    parser.add_argument("csv_file", nargs="?", default=SALARY_CSV)
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.0001,
+        help="learning rate (small due to large salary values)",
+    )
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument(
+        "--solver",
+        choices=["gd", "lstsq", "stats"],
+        default="gd",
+        help=(
+            "gd: gradient descent, lstsq: normal equations via least squares, "
+            "stats: normal equations from X^T X and X^T y streamed over the CSV"
+        ),
+    )
+    parser.add_argument(
+        "--standardize",
+        action="store_true",
+        help="scale features to zero mean and unit variance for gradient descent",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        help=(
+            "stream the CSV in batches of this many rows and update theta per batch "
+            "(mini-batch SGD); the fit is not plotted as the data is never fully loaded"
+        ),
+    )
+    parser.add_argument(
+        "--epochs", type=int, default=10, help="passes over the data with --batch-size"
+    )
+    parser.add_argument(
+        "--no-shuffle",
+        action="store_true",
+        help="keep the batch order fixed with --batch-size",
+    )
+    parser.add_argument(
+        "--tol",
+        type=float,
+        help="stop once the loss improves by less than this fraction per evaluation",
+    )
+    parser.add_argument(
+        "--record-every",
+        type=int,
+        default=1,
+        help="evaluate and record the loss every K iterations (0: never)",
+    )
+    parser.add_argument(
+        "--ring-size",
+        type=int,
+        help="keep only the latest N recorded losses, in a fixed-size buffer",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="render with the Agg backend and only save the figure, without a display",
+    )
+    parser.add_argument(
+        "--density",
+        choices=["auto", "scatter", "hexbin", "raster"],
+        default="auto",
+        help="how to draw the data points (auto: hexbin for large datasets)",
+    )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        metavar="N",
+        help=(
+            "also fit N bootstrap resamples by least squares, print confidence intervals "
+            "for theta and draw a confidence band on the plot"
+        ),
+    )
+    parser.add_argument(
+        "--confidence", type=float, default=0.95, help="confidence level with --bootstrap"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="fit the bootstrap resamples in chunks across this many processes",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed for --bootstrap")
+    parser.add_argument(
+        "--plot",
+        action=argparse.BooleanOptionalAction,
+        default=plot,
+        help="draw the fit and loss curve (--no-plot never imports matplotlib)",
+    )
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.solver == "stats":
+        X = y = None
+        result = fit_sufficient_statistics(args.csv_file)
+    elif args.solver == "lstsq":
+        X, y = load_salary(args.csv_file)
+        result = fit_lstsq(X, y)
+    elif args.batch_size:
+        X = y = None
+        result = fit_sgd_streaming(
+            args.csv_file,
+            alpha=args.alpha,
+            batch_size=args.batch_size,
+            epochs=args.epochs,
+            tol=args.tol,
+            shuffle=not args.no_shuffle,
+        )
+    else:
+        X, y = load_salary(args.csv_file)
+        result = fit_gradient_descent(
+            X,
+            y,
+            args.alpha,
+            args.iterations,
+            args.tol,
+            standardize=args.standardize,
+            record_every=args.record_every,
+            ring_size=args.ring_size,
+        )
+    elapsed = time.perf_counter() - start
+
+    theta_0, theta_1 = result.theta
+    print(f"Final parameters:")
+    print(f"  theta_0 (y-intercept): {theta_0:.2f}")
+    print(f"  theta_1 (gradient): {theta_1:.2f}")
+    print(f"  Equation: Salary = {theta_0:.2f} + {theta_1:.2f} * YearsExperience")
+    status = "converged" if result.converged else "stopped"
+    unit = "epochs" if args.batch_size and args.solver == "gd" else "iterations"
+    print(f"  {status} after {result.iterations} {unit} in {elapsed * 1000:.1f} ms")
+
+    thetas = band_theta = None
+    if args.bootstrap:
+        if X is None:
+            X, y = load_salary(args.csv_file)
+        start = time.perf_counter()
+        thetas, intervals = bootstrap(
+            X, y, args.bootstrap, args.confidence, args.seed, workers=args.workers
+        )
+        elapsed = time.perf_counter() - start
+        # The resamples are fitted by least squares, so the intervals are
+        # centred on the least-squares estimate, whichever solver ran above
+        band_theta = fit_lstsq(X, y).theta
+        print(
+            f"Bootstrap {args.confidence:.0%} confidence intervals for the least-squares "
+            f"estimate ({args.bootstrap} resamples):"
+        )
+        for j, (low, high) in enumerate(intervals):
+            print(f"  theta_{j}: {band_theta[j]:.2f} in [{low:.2f}, {high:.2f}]")
+        if not np.allclose(band_theta, result.theta):
+            print("  (the parameters printed above are from another fit, not least squares)")
+        print(f"  resampled and fitted in {elapsed * 1000:.1f} ms")
+
+    if args.plot and X is not None:
+        if args.headless:
+            import matplotlib
+
+            matplotlib.use("Agg")
+        plot_results(
+            X,
+            y,
+            result,
+            show=not args.headless,
+            density=args.density,
+            thetas=thetas,
+            confidence=args.confidence,
+            band_theta=band_theta,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,86 @@
-import matplotlib.pyplot as plt
-import pandas as pd
-
-# Read the salary dataset
-df = pd.read_csv("path/to/06-ml-math/01-linear-regression/salary.csv")
-
-# Create scatter plot
-plt.figure(figsize=(10, 6))
-plt.scatter(df["YearsExperience"], df["Salary"], color="blue", alpha=0.7)
-plt.xlabel("Years of Experience")
-plt.ylabel("Salary ($)")
-plt.title("Salary vs Years of Experience")
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig("salary_plot.png")
-plt.show()
+import argparse
+import os
+
+SALARY_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "salary.csv")
+
+DENSITY_MODES = ("auto", "scatter", "hexbin", "raster")
+# Above this many points, "auto" switches from a scatter to a hexbin
+DENSITY_THRESHOLD = 50_000
+
+
+def plot_points(ax, X, y, density="auto", threshold=DENSITY_THRESHOLD, **scatter_kwargs):
+    """Draw the data on `ax`, as a scatter for small data and a density plot for large.
+
+    "hexbin" bins the points on a fixed grid, so render time and file size
+    stay flat as the data grows. "raster" keeps the scatter but rasterizes
+    that layer, which bounds the file size but not the render time.
+    """
+    if density == "auto":
+        density = "hexbin" if len(X) > threshold else "scatter"
+
+    if density == "hexbin":
+        bins = ax.hexbin(X, y, gridsize=80, bins="log", cmap="Blues", mincnt=1)
+        bins.set_label(scatter_kwargs.get("label"))
+        ax.figure.colorbar(bins, ax=ax, label="Points per bin")
+        return bins
+
+    return ax.scatter(X, y, rasterized=density == "raster", **scatter_kwargs)
+
+
+def plot_salary(X, y, path="salary_plot.png", show=True, density="auto"):
+    import matplotlib.pyplot as plt
+
+    # Create scatter plot
+    fig, ax = plt.subplots(figsize=(10, 6))
+    plot_points(ax, X, y, density, color="blue", alpha=0.7)
+    ax.set_xlabel("Years of Experience")
+    ax.set_ylabel("Salary ($)")
+    ax.set_title("Salary vs Years of Experience")
+    ax.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(path)
+    if show:
+        plt.show()
+    plt.close(fig)
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(
+        prog=prog, description="Scatter plot of salary vs experience."
+    )
+    parser.add_argument("csv_file", nargs="?", default=SALARY_CSV)
+    parser.add_argument("--out", default="salary_plot.png")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="render with the Agg backend and only save the figure, without a display",
+    )
+    parser.add_argument(
+        "--density",
+        choices=DENSITY_MODES,
+        default="auto",
+        help=f"how to draw the points (auto: hexbin above {DENSITY_THRESHOLD} rows)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.headless:
+        import matplotlib
+
+        matplotlib.use("Agg")
+
+    import pandas as pd
+
+    # Read the salary dataset
+    df = pd.read_csv(args.csv_file)
+
+    plot_salary(
+        df["YearsExperience"],
+        df["Salary"],
+        args.out,
+        show=not args.headless,
+        density=args.density,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import argparse
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from linear_regression import SALARY_CSV, as_matrix, fit_gradient_descent, load_salary
+
+INITS = ("zeros", "mean", "random")
+
+
+def initial_theta(init, y, n_features, rng):
+    theta = np.zeros(n_features + 1)
+    if init == "mean":
+        # Start from the flat line through the mean of y
+        theta[0] = y.mean()
+    elif init == "random":
+        theta[:] = rng.normal(0, y.std(), size=n_features + 1)
+    return theta
+
+
+def sweep_vectorized(X, y, alphas, iterations, thetas, tol=None):
+    """Train every configuration at once, one theta column per configuration.
+
+    Each step does a single (m, n) x (n, k) product for the k configurations
+    still training, rather than k separate passes over X. A configuration
+    drops out once it reaches its iteration budget, converges (relative loss
+    improvement <= `tol`) or its loss rises, and its runtime is the wall
+    clock at that point.
+    """
+    X = as_matrix(X)
+    y = np.asarray(y, dtype=np.float64)
+    m, n = X.shape
+    k = len(alphas)
+
+    alphas = np.asarray(alphas, dtype=np.float64)
+    iterations = np.asarray(iterations)
+    theta = np.array(thetas, dtype=np.float64).T
+
+    # One flat buffer, viewed as a contiguous (m, active) matrix every step
+    residual_buf = np.empty(m * k)
+
+    final_loss = np.full(k, np.nan)
+    steps = np.zeros(k, dtype=int)
+    converged = np.zeros(k, dtype=bool)
+    runtime = np.zeros(k)
+    previous = np.full(k, np.inf)
+    active = np.ones(k, dtype=bool)
+
+    start = time.perf_counter()
+    with np.errstate(over="ignore", invalid="ignore"):
+        for i in range(iterations.max()):
+            idx = np.flatnonzero(active)
+            if not len(idx):
+                break
+
+            t = theta[:, idx]
+            residual = residual_buf[: m * len(idx)].reshape(m, len(idx))
+            np.dot(X, t[1:], out=residual)
+            residual += t[0]
+            np.subtract(y[:, np.newaxis], residual, out=residual)
+
+            loss = np.einsum("ij,ij->j", residual, residual) / m
+            grad = np.empty_like(t)
+            grad[0] = residual.sum(axis=0)
+            grad[1:] = X.T @ residual
+            grad *= -2 / m
+            theta[:, idx] = t - alphas[idx] * grad
+
+            final_loss[idx] = loss
+            steps[idx] = i + 1
+            done = (i + 1 >= iterations[idx]) | ~np.isfinite(loss)
+            if tol is not None:
+                improvement = previous[idx] - loss
+                stalled = np.isfinite(previous[idx]) & (improvement <= tol * previous[idx])
+                # As in fit_gradient_descent, a rising loss stops without converging
+                converged[idx[stalled & (improvement >= 0)]] = True
+                done |= stalled
+            previous[idx] = loss
+
+            runtime[idx[done]] = time.perf_counter() - start
+            active[idx[done]] = False
+
+    return theta.T, final_loss, steps, converged, runtime
+
+
+def _fit_one(X, y, alpha, n_iterations, theta, tol):
+    start = time.perf_counter()
+    with np.errstate(over="ignore", invalid="ignore"):
+        result = fit_gradient_descent(X, y, alpha, n_iterations, tol, theta)
+    return result, time.perf_counter() - start
+
+
+def sweep_process_pool(X, y, alphas, iterations, thetas, tol=None, workers=None):
+    """Train each configuration with fit_gradient_descent in its own worker process."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_fit_one, X, y, alpha, n_iterations, theta, tol)
+            for alpha, n_iterations, theta in zip(alphas, iterations, thetas)
+        ]
+        results = [future.result() for future in futures]
+
+    return (
+        np.array([r.theta for r, _ in results]),
+        np.array([r.losses[-1] for r, _ in results]),
+        np.array([r.iterations for r, _ in results]),
+        np.array([r.converged for r, _ in results]),
+        np.array([elapsed for _, elapsed in results]),
+    )
+
+
+def run_sweep(X, y, alphas, iterations, inits, tol=None, workers=None, seed=0):
+    """Train the full (alpha, iterations, init) grid and return a results table."""
+    rng = np.random.default_rng(seed)
+    n_features = as_matrix(X).shape[1]
+    starts = {init: initial_theta(init, y, n_features, rng) for init in inits}
+    grid = list(itertools.product(alphas, iterations, inits))
+
+    config_alphas = [alpha for alpha, _, _ in grid]
+    config_iterations = [n for _, n, _ in grid]
+    config_thetas = [starts[init] for _, _, init in grid]
+
+    if workers:
+        sweep = sweep_process_pool(
+            X, y, config_alphas, config_iterations, config_thetas, tol, workers
+        )
+    else:
+        sweep = sweep_vectorized(X, y, config_alphas, config_iterations, config_thetas, tol)
+    theta, final_loss, steps, converged, runtime = sweep
+
+    table = pd.DataFrame(grid, columns=["alpha", "iterations", "init"])
+    table["final_loss"] = final_loss
+    table["converged_at"] = np.where(converged, steps, -1)
+    table["runtime_ms"] = runtime * 1000
+    for j in range(theta.shape[1]):
+        table[f"theta_{j}"] = theta[:, j]
+    return table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Sweep learning rate, iterations and initialisation for gradient descent."
+    )
+    parser.add_argument("csv_file", nargs="?", default=SALARY_CSV)
+    parser.add_argument(
+        "--alphas", type=float, nargs="+", default=[1e-5, 3e-5, 1e-4, 3e-4, 1e-3]
+    )
+    parser.add_argument("--iterations", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--inits", choices=INITS, nargs="+", default=["zeros", "mean"])
+    parser.add_argument(
+        "--tol",
+        type=float,
+        default=1e-9,
+        help="stop a configuration once its loss improves by less than this fraction",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="fan configurations out over this many processes instead of vectorizing",
+    )
+    parser.add_argument("--out", help="also write the results table to this CSV")
+    args = parser.parse_args()
+
+    X, y = load_salary(args.csv_file)
+
+    start = time.perf_counter()
+    table = run_sweep(X, y, args.alphas, args.iterations, args.inits, args.tol, args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(table.sort_values("final_loss").to_string(index=False))
+    print(f"{len(table)} configurations in {elapsed:.2f} s")
+    if args.out:
+        table.to_csv(args.out, index=False)
@@ -1,50 +1,35 @@
-from manimlib import *
+import os
+import sys
+
 import numpy as np
+from manimlib import *
+
+# manimgl loads scenes by file path, so make the shared modules next to them importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dataset import load_dataset, nice_range
+from fixtures import CostSurface
 
 
 class CostSurfaceGradientDescent(ThreeDScene):
+    num_steps = 15
+
     def construct(self):
-        # Same data points from scatter_plot.py
-        data_points = np.array([
-            [0.5, 3.0],
-            [1, 1.8],
-            [1.5, 4.5],
-            [5, 12.5],
-            [5.5, 10.0],
-            [6, 11.3],
-            [6.5, 14.8],
-            [7, 13.0],
-            [7.3, 16.2],
-            [8, 15.5],
-            [8.5, 18.0],
-            [9, 17.2],
-            [9.5, 19.5],
-        ])
-        X = data_points[:, 0]
-        Y = data_points[:, 1]
-        m = len(X)
-
-        # Optimal theta values (center of the paraboloid)
-        optimal_theta0, optimal_theta1 = 2.0, 2.0
-
-        # Parabolic cost function: J = a*(theta0 - opt0)^2 + b*(theta1 - opt1)^2
-        # Equal coefficients for symmetric paraboloid
-        coeff = 12  # Steepness of the parabola
-
-        def cost_function(theta0, theta1):
-            return coeff * (theta0 - optimal_theta0) ** 2 + coeff * (theta1 - optimal_theta1) ** 2
-
-        # Gradient of the paraboloid
-        def gradient(theta0, theta1):
-            d_theta0 = 2 * coeff * (theta0 - optimal_theta0)
-            d_theta1 = 2 * coeff * (theta1 - optimal_theta1)
-            return np.array([d_theta0, d_theta1])
-
-        # Set up 3D axes (symmetric ranges for circular cone)
+        # Same data points as scatter_plot.py
+        dataset = load_dataset()
+
+        # Window the cost around its minimum; the bowl is much steeper along
+        # theta1 than theta0, so each axis gets its own range
+        theta0_range, theta1_range = dataset.cost_window()
+        _, _, grid_cost = dataset.cost_grid(theta0_range, theta1_range)
+        theta0_step = (theta0_range[1] - theta0_range[0]) / 8
+        theta1_step = (theta1_range[1] - theta1_range[0]) / 8
+
+        # Set up 3D axes
         axes = ThreeDAxes(
-            x_range=(-2, 6, 1),
-            y_range=(-2, 6, 1),
-            z_range=(0, 200, 50),
+            x_range=(*theta0_range, theta0_step),
+            y_range=(*theta1_range, theta1_step),
+            z_range=nice_range(grid_cost, ticks=4),
             height=6,
             width=6,
             depth=5,
@@ -55,11 +40,12 @@ class CostSurfaceGradientDescent(ThreeDScene):
         y_label = Text("θ₁", font_size=36).next_to(axes.y_axis, UP)
         z_label = Text("J", font_size=36).next_to(axes.z_axis, OUT)
 
-        # Create the cost surface
-        surface = ParametricSurface(
-            lambda u, v: axes.c2p(u, v, cost_function(u, v)),
-            u_range=(-2, 6),
-            v_range=(-2, 6),
+        # Create the cost surface (evaluated over the whole grid at once)
+        surface = CostSurface(
+            axes,
+            dataset,
+            u_range=theta0_range,
+            v_range=theta1_range,
             resolution=(40, 40),
         )
         surface.set_color(BLUE_E)
@@ -72,7 +58,11 @@ class CostSurfaceGradientDescent(ThreeDScene):
             theta=-45 * DEGREES,
             phi=35 * DEGREES,
         )
-        frame.move_to(axes.c2p(3.5, 3.5, 60))
+        frame.move_to(axes.c2p(
+            theta0_range[0] + 5.5 * theta0_step,
+            theta1_range[0] + 5.5 * theta1_step,
+            0.3 * axes.z_range[1],
+        ))
         frame.scale(1.5)  # Zoom out
 
         # Add axes and surface
@@ -87,11 +77,37 @@ class CostSurfaceGradientDescent(ThreeDScene):
         self.wait(0.5)
 
         # Gradient descent animation
-        # Starting point (symmetric position)
-        theta0_current = 5.0
-        theta1_current = 5.0
-        learning_rate = 0.01
-        num_steps = 15
+        # Starting point, up the slope from the minimum
+        self.descend(
+            dataset,
+            axes,
+            theta0_range[0] + 7 * theta0_step,
+            theta1_range[0] + 7 * theta1_step,
+        )
+
+        # Final wait at the minimum
+        self.wait(1)
+
+        # Optionally rotate the camera to show the final result
+        self.play(
+            frame.animate.set_euler_angles(
+                theta=30 * DEGREES,
+                phi=60 * DEGREES,
+            ),
+            run_time=2,
+        )
+        self.wait(1)
+
+    def descend(self, dataset, axes, theta0_current, theta1_current):
+        """Step through gradient descent, one arrow and one move per step."""
+        # The real MSE cost over the data, J(theta0, theta1), and its gradient
+        cost_function = dataset.cost
+        gradient = dataset.gradient
+
+        # Just under 1 / (largest curvature), so the steep theta1 direction
+        # settles in a step or two and the rest shows the slow walk along the valley
+        learning_rate = 0.9 / dataset.max_curvature
+        num_steps = self.num_steps
 
         # Create the gradient descent point
         def get_point_position(t0, t1):
@@ -158,15 +174,61 @@ class CostSurfaceGradientDescent(ThreeDScene):
             if step < num_steps - 1:
                 self.wait(0.2)
 
-        # Final wait at the minimum
-        self.wait(1)
 
-        # Optionally rotate the camera to show the final result
-        self.play(
-            frame.animate.set_euler_angles(
-                theta=30 * DEGREES,
-                phi=60 * DEGREES,
-            ),
-            run_time=2,
-        )
-        self.wait(1)
+class CostSurfaceTrajectory(CostSurfaceGradientDescent):
+    """The same descent, computed up front and played as one animation.
+
+    Each learning rate's whole path comes from Dataset.descent_path as an
+    array, so the render costs one play call however many steps are shown,
+    and several learning rates can race side by side.
+    """
+
+    num_steps = 200
+    # Learning rates as fractions of 1 / (largest curvature): cautious, the
+    # step-by-step scene's rate, and close to the 2 / curvature limit where
+    # the steep direction zig-zags across the valley
+    learning_rates = (0.3, 0.9, 1.9)
+    colors = (RED, YELLOW, PURPLE)
+    run_time = 8
+
+    def descend(self, dataset, axes, theta0, theta1):
+        legend = VGroup()
+        spheres = Group()
+        animations = []
+        for fraction, color in zip(self.learning_rates, self.colors):
+            learning_rate = fraction / dataset.max_curvature
+            path = dataset.descent_path(theta0, theta1, learning_rate, self.num_steps)
+            points = axes.c2p(path[:, 0], path[:, 1], dataset.cost(path[:, 0], path[:, 1]))
+
+            # One corner per step, so ShowCreation reveals the trail a step at
+            # a time, in lockstep with the sphere
+            trail = VMobject(color=color, stroke_width=4)
+            trail.set_points_as_corners(points)
+
+            sphere = Sphere(radius=0.15, color=color)
+            sphere.move_to(points[0])
+            spheres.add(sphere)
+
+            animations.append(ShowCreation(trail, rate_func=linear))
+            animations.append(
+                UpdateFromAlphaFunc(
+                    sphere,
+                    lambda mob, alpha, points=points: mob.move_to(point_along(points, alpha)),
+                    rate_func=linear,
+                )
+            )
+            legend.add(Text(f"α = {learning_rate:.3g}", font_size=28, color=color))
+
+        legend.arrange(DOWN, aligned_edge=LEFT).to_corner(UL)
+        legend.fix_in_frame()
+
+        self.play(FadeIn(spheres, scale=0.5), FadeIn(legend))
+        self.wait(0.3)
+        self.play(*animations, run_time=self.run_time)
+
+
+def point_along(points, alpha):
+    """Linearly interpolate a position `alpha` of the way through a sequence of points."""
+    position = alpha * (len(points) - 1)
+    i = min(int(position), len(points) - 2)
+    return points[i] + (position - i) * (points[i + 1] - points[i])
@@ -0,0 +1,203 @@
+import csv
+import math
+import os
+from functools import cached_property, lru_cache
+
+import numpy as np
+
+SALARY_CSV = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "..",
+    "..",
+    "jfgrea27.github.io",
+    "static",
+    "posts",
+    "06-ml-math",
+    "01-linear-regression",
+    "salary.csv",
+)
+
+# Data points that roughly follow y = 2x + 1 with noisy scatter
+DATA_POINTS = np.array([
+    [0.5, 3.0],
+    [1, 1.8],
+    [1.5, 4.5],
+    [5, 12.5],
+    [5.5, 10.0],
+    [6, 11.3],
+    [6.5, 14.8],
+    [7, 13.0],
+    [7.3, 16.2],
+    [8, 15.5],
+    [8.5, 18.0],
+    [9, 17.2],
+    [9.5, 19.5],
+])
+
+# Set to a CSV path (or "salary") to render every scene against that data instead
+DATASET_ENV = "LINREG_DATASET"
+
+
+def nice_range(values, ticks=10):
+    """Return an axis range (0, max, step) covering `values` with about `ticks` ticks."""
+    top = max(float(np.max(values)), 1e-9)
+    raw_step = top / ticks
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw_step)
+    return (0, step * math.ceil(top / step), step)
+
+
+class Dataset:
+    """The (x, y) points shared by the linear regression scenes.
+
+    Derived quantities (the least-squares line, residuals and cost grids)
+    are computed on first use and cached, so scenes built from the same
+    Dataset reuse the same arrays.
+    """
+
+    def __init__(self, points, x_range=None, y_range=None, line=None, highlight=None):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.X = self.points[:, 0]
+        self.Y = self.points[:, 1]
+        self.m = len(self.X)
+        self.x_range = x_range or nice_range(self.X)
+        self.y_range = y_range or nice_range(self.Y)
+        # (intercept, slope) of the line the scenes present as the best fit,
+        # and the point whose residual is singled out; derived when not given
+        self._line = line
+        self._highlight = highlight
+
+    @classmethod
+    def from_csv(cls, path=SALARY_CSV, x_column="YearsExperience", y_column="Salary"):
+        with open(path, newline="") as f:
+            header = next(csv.reader(f))
+        columns = (header.index(x_column), header.index(y_column))
+        return cls(np.loadtxt(path, delimiter=",", skiprows=1, usecols=columns, ndmin=2))
+
+    @cached_property
+    def sums(self):
+        """Sufficient statistics (sum x, sum y, sum x^2, sum xy, sum y^2) of the data."""
+        X, Y = self.X, self.Y
+        return X.sum(), Y.sum(), X @ X, X @ Y, Y @ Y
+
+    @cached_property
+    def fit(self):
+        """Least-squares (theta_0, theta_1), i.e. (intercept, slope)."""
+        sx, sy, sxx, sxy, _ = self.sums
+        slope = (self.m * sxy - sx * sy) / (self.m * sxx - sx * sx)
+        return (sy - slope * sx) / self.m, slope
+
+    @cached_property
+    def residuals(self):
+        """y - y_hat under the least-squares line."""
+        intercept, slope = self.fit
+        return self.Y - self.predict(intercept, slope)
+
+    @property
+    def line(self):
+        return self._line or self.fit
+
+    @cached_property
+    def highlight(self):
+        """Index of the point to single out: the largest residual unless given."""
+        if self._highlight is not None:
+            return self._highlight
+        return int(np.argmax(np.abs(self.Y - self.predict(*self.line))))
+
+    def predict(self, intercept, slope):
+        return intercept + slope * self.X
+
+    def cost(self, theta0, theta1):
+        """MSE of the line theta0 + theta1 * x; broadcasts over array arguments.
+
+        The square is expanded into the cached sums, so each (theta0, theta1)
+        costs O(1) rather than a pass over the m points:
+        J = (sum y^2 - 2 t0 sum y - 2 t1 sum xy + m t0^2 + 2 t0 t1 sum x + t1^2 sum x^2) / m
+        """
+        sx, sy, sxx, sxy, syy = self.sums
+        return (
+            syy
+            - 2 * theta0 * sy
+            - 2 * theta1 * sxy
+            + self.m * theta0 ** 2
+            + 2 * theta0 * theta1 * sx
+            + theta1 ** 2 * sxx
+        ) / self.m
+
+    def gradient(self, theta0, theta1):
+        """(dJ/dtheta0, dJ/dtheta1) of the MSE, also from the cached sums."""
+        sx, sy, sxx, sxy, _ = self.sums
+        d_theta0 = 2 * (self.m * theta0 + theta1 * sx - sy) / self.m
+        d_theta1 = 2 * (theta0 * sx + theta1 * sxx - sxy) / self.m
+        return np.array([d_theta0, d_theta1])
+
+    @cached_property
+    def hessian(self):
+        """The MSE's Hessian, which is constant since the cost is quadratic."""
+        sx, _, sxx, _, _ = self.sums
+        return 2 / self.m * np.array([[self.m, sx], [sx, sxx]])
+
+    @cached_property
+    def max_curvature(self):
+        """Largest eigenvalue of the Hessian; GD is stable for alpha < 2 / this."""
+        return float(np.linalg.eigvalsh(self.hessian)[-1])
+
+    def descent_path(self, theta0, theta1, learning_rate, num_steps):
+        """Every gradient descent iterate from (theta0, theta1), as a (num_steps + 1, 2) array.
+
+        On a quadratic cost each step multiplies the offset from the optimum
+        by (I - alpha * H), so in the Hessian's eigenbasis iterate k is just
+        the start scaled by (1 - alpha * lambda)^k. The whole path is one
+        broadcast power instead of a Python loop over the steps.
+        """
+        eigenvalues, eigenvectors = np.linalg.eigh(self.hessian)
+        optimum = np.array(self.fit)
+        offset = eigenvectors.T @ (np.array([theta0, theta1]) - optimum)
+        k = np.arange(num_steps + 1)[:, np.newaxis]
+        scale = (1 - learning_rate * eigenvalues) ** k
+        return optimum + (scale * offset) @ eigenvectors.T
+
+    def cost_window(self, rise=None):
+        """(theta0_range, theta1_range) around the optimum for plotting the cost.
+
+        Each range spans the distance along that axis over which the cost
+        rises by `rise` (default: the variance of y, i.e. the cost of the
+        flat line through the mean), so the bowl fills the window whatever
+        the units of the data.
+        """
+        sx, _, sxx, _, _ = self.sums
+        rise = np.var(self.Y) if rise is None else rise
+        opt0, opt1 = self.fit
+        # J rises by d^2 along theta0 and by d^2 * mean(x^2) along theta1
+        d0 = np.sqrt(rise)
+        d1 = np.sqrt(rise / (sxx / self.m))
+        return (opt0 - d0, opt0 + d0), (opt1 - d1, opt1 + d1)
+
+    @lru_cache(maxsize=8)
+    def cost_grid(self, theta0_range, theta1_range, resolution=(40, 40)):
+        """Return (theta0, theta1, J) meshes of the cost over the given ranges."""
+        theta0, theta1 = np.meshgrid(
+            np.linspace(*theta0_range, resolution[0]),
+            np.linspace(*theta1_range, resolution[1]),
+            indexing="ij",
+        )
+        return theta0, theta1, self.cost(theta0, theta1)
+
+
+@lru_cache(maxsize=None)
+def load_dataset(source=None):
+    """Load the scenes' dataset once per process.
+
+    `source` defaults to the LINREG_DATASET environment variable; if that
+    is unset the hand-picked DATA_POINTS are used, on the scenes' original
+    (0, 10) x (0, 20) axes with the line y = 2x + 1.
+    """
+    source = source or os.environ.get(DATASET_ENV)
+    if not source:
+        return Dataset(
+            DATA_POINTS, x_range=(0, 10, 1), y_range=(0, 20, 1), line=(1.0, 2.0), highlight=3
+        )
+    if source == "salary":
+        source = SALARY_CSV
+    return Dataset.from_csv(source)
@@ -0,0 +1,117 @@
+import numpy as np
+from manimlib import *
+
+from dataset import load_dataset
+
+
+def make_axes(dataset=None):
+    """The 2D axes every linear regression scene draws its data on."""
+    dataset = dataset or load_dataset()
+    axes = Axes(
+        x_range=dataset.x_range,
+        y_range=dataset.y_range,
+        # The axes will be stretched so as to match the specified
+        # height and width
+        height=6,
+        width=10,
+        # Axes is made of two NumberLine mobjects.  You can specify
+        # their configuration with axis_config
+        axis_config={
+            "stroke_color": GREY_A,
+            "stroke_width": 2,
+        },
+        # Alternatively, you can specify configuration for just one
+        # of them, like this.
+        y_axis_config={
+            "include_tip": False,
+        },
+    )
+    # Keyword arguments of add_coordinate_labels can be used to
+    # configure the DecimalNumber mobjects which it creates and
+    # adds to the axes
+    axes.add_coordinate_labels(
+        font_size=20,
+        num_decimal_places=1,
+    )
+    return axes
+
+
+def make_dots(axes, dataset=None, color=RED):
+    """One Dot per data point, positioned with a single vectorized c2p call."""
+    dataset = dataset or load_dataset()
+    dots = VGroup()
+    for position in axes.c2p(dataset.X, dataset.Y):
+        dot = Dot(color=color)
+        dot.move_to(position)
+        dots.add(dot)
+    return dots
+
+
+class ResidualLines(VMobject):
+    """Every residual, point to line, as straight subpaths of a single VMobject.
+
+    The points are allocated once; set_line rewrites them in place from one
+    vectorized prediction, so animating the line costs the same per frame
+    however many data points there are, and no mobjects are created.
+    """
+
+    def __init__(self, axes, dataset=None, line=None, color=YELLOW, stroke_width=2, **kwargs):
+        super().__init__(color=color, stroke_width=stroke_width, **kwargs)
+        self.axes = axes
+        self.dataset = dataset or load_dataset()
+        # The data end of each residual never moves
+        self.data_points = axes.c2p(self.dataset.X, self.dataset.Y)
+        self.set_line(*(line or self.dataset.line))
+
+    def set_line(self, intercept, slope):
+        starts = self.data_points
+        ends = self.axes.c2p(self.dataset.X, self.dataset.predict(intercept, slope))
+        # Each segment is anchor, handle, anchor; a following handle sitting on
+        # the last anchor starts a new subpath. The trailing one is dropped.
+        segments = np.stack([starts, 0.5 * (starts + ends), ends, ends], axis=1)
+        self.set_points(segments.reshape(-1, 3)[:-1])
+        return self
+
+    def track(self, intercept, slope):
+        """Follow two ValueTrackers (or anything with get_value) with an updater."""
+        self.add_updater(lambda mob: mob.set_line(intercept.get_value(), slope.get_value()))
+        return self
+
+
+class CostSurface(Surface):
+    """The dataset's MSE cost J(theta0, theta1), drawn over 3D axes.
+
+    Surface.init_points calls uv_func once per vertex (three times, for the
+    du/dv nudges) through np.apply_along_axis. Here the whole grid and both
+    nudged copies are evaluated as arrays: one Dataset.cost call, which is
+    O(1) per vertex, and one vectorized axes.c2p per grid.
+    """
+
+    def __init__(self, axes, dataset=None, **kwargs):
+        # init_points runs inside Surface.__init__, so these must be set first
+        self.axes = axes
+        self.dataset = dataset or load_dataset()
+        super().__init__(**kwargs)
+
+    def uv_func(self, u, v):
+        return self.axes.c2p(u, v, self.dataset.cost(u, v))
+
+    @Mobject.affects_data
+    def init_points(self):
+        nu, nv = self.resolution
+        u, v = np.meshgrid(
+            np.linspace(*self.u_range, nu),
+            np.linspace(*self.v_range, nv),
+            indexing="ij",
+        )
+        u = u.ravel()
+        v = v.ravel()
+        self.set_points(self.uv_func(u, v))
+        # The nudges are a fraction of each range rather than Surface's fixed
+        # epsilon in theta units: over a real dataset's window (tens of
+        # thousands wide in theta0) that would be far below float32
+        # resolution in scene units, and the normals would collapse
+        du = self.epsilon * (self.u_range[1] - self.u_range[0])
+        dv = self.epsilon * (self.v_range[1] - self.v_range[0])
+        self.data['du_point'][:] = self.uv_func(u + du, v)
+        self.data['dv_point'][:] = self.uv_func(u, v + dv)
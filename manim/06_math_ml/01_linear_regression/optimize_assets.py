@@ -0,0 +1,221 @@
+import argparse
+import itertools
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from render_scenes import POST_DIR, SCENE_DIR
+
+POST_MARKDOWN = os.path.join(
+    SCENE_DIR,
+    "..",
+    "..",
+    "..",
+    "jfgrea27.github.io",
+    "content",
+    "posts",
+    "06-ml-math",
+    "01-linear-regression.md",
+)
+
+# Still images are compared for duplicates; animations' first frames are
+# too alike (the scenes all open on the same axes) to tell apart this way
+STILL_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+# src="..." / href="..." attributes, markdown ![alt](...) images and the
+# animation shortcode's src argument
+REFERENCE_PATTERN = re.compile(r'(?:src|href)\s*=\s*"([^"]+)"|!\[[^\]]*\]\(([^)\s]+)')
+
+
+def load_frames(path):
+    """Return the (RGBA frame, duration in ms) pairs of an animated image."""
+    with Image.open(path) as image:
+        default = image.info.get("duration", 100)
+        return [
+            (frame.convert("RGBA"), frame.info.get("duration", default))
+            for frame in ImageSequence.Iterator(image)
+        ]
+
+
+def dedupe_frames(frames):
+    """Merge runs of identical consecutive frames into one longer frame.
+
+    manim holds a still image for every frame of a wait(), so the scenes'
+    GIFs repeat frames heavily; each run collapses to a single frame
+    shown for the sum of the run's durations.
+    """
+    merged = []
+    previous = None
+    for frame, duration in frames:
+        pixels = np.asarray(frame)
+        if previous is not None and np.array_equal(pixels, previous):
+            merged[-1][1] += duration
+        else:
+            merged.append([frame, duration])
+            previous = pixels
+    return [(frame, duration) for frame, duration in merged]
+
+
+def save_animation(frames, path, **options):
+    images = [frame for frame, _ in frames]
+    images[0].save(
+        path,
+        save_all=True,
+        append_images=images[1:],
+        duration=[duration for _, duration in frames],
+        loop=0,
+        **options,
+    )
+
+
+def write_webp(frames, path):
+    # The GIFs are already palettised and dithered, which lossy WebP encodes
+    # badly (several times the GIF's size). Lossless with minimize_size, which
+    # picks the cheapest keyframe/delta layout, comes out well under the GIF;
+    # method 6 is many times slower for ~1% less
+    save_animation(frames, path, lossless=True, method=4, minimize_size=True)
+
+
+def write_gif(frames, path):
+    """Write the de-duplicated GIF fallback, keeping the original if it was smaller."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = os.path.join(tmp, os.path.basename(path))
+        save_animation(frames, tmp_path, optimize=True, disposal=1)
+        if not os.path.exists(path) or os.path.getsize(tmp_path) < os.path.getsize(path):
+            shutil.move(tmp_path, path)
+
+
+def write_mp4(frames, path, crf=28):
+    """Encode the frames as H.264 with ffmpeg, if it is installed.
+
+    Video needs a constant frame rate, so de-duplicated frames are repeated
+    back out to the shortest frame duration; H.264 stores the repeats as
+    near-empty frames anyway.
+    """
+    if shutil.which("ffmpeg") is None:
+        return False
+
+    step = min(duration for _, duration in frames) or 10
+    width, height = frames[0][0].size
+    command = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}",
+        "-framerate", f"{1000 / step:g}", "-i", "-",
+        # yuv420p needs even dimensions
+        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p", "-crf", str(crf),
+        "-movflags", "+faststart",
+        path,
+    ]
+    with subprocess.Popen(command, stdin=subprocess.PIPE) as ffmpeg:
+        for frame, duration in frames:
+            data = frame.tobytes()
+            for _ in range(max(1, round(duration / step))):
+                ffmpeg.stdin.write(data)
+        ffmpeg.stdin.close()
+    if ffmpeg.returncode:
+        raise subprocess.CalledProcessError(ffmpeg.returncode, command)
+    return True
+
+
+def optimize_animation(gif_path, formats=("webp", "mp4", "gif")):
+    """Write the WebP/MP4 alternatives and the slimmed GIF next to `gif_path`.
+
+    Returns (frames before, frames after, {path: bytes}) for reporting.
+    """
+    frames = load_frames(gif_path)
+    deduped = dedupe_frames(frames)
+    stem = os.path.splitext(gif_path)[0]
+
+    if "webp" in formats:
+        write_webp(deduped, f"{stem}.webp")
+    if "mp4" in formats and not write_mp4(deduped, f"{stem}.mp4"):
+        print(f"ffmpeg not found, skipping {os.path.basename(stem)}.mp4")
+    # The fallback is rewritten last, since it is also the input
+    if "gif" in formats:
+        write_gif(deduped, gif_path)
+
+    sizes = {
+        path: os.path.getsize(path)
+        for path in (f"{stem}.{ext}" for ext in ("gif", "webp", "mp4"))
+        if os.path.exists(path)
+    }
+    return len(frames), len(deduped), sizes
+
+
+def average_hash(path, size=16):
+    """A size x size bitmap of which pixels are brighter than the mean.
+
+    Renders of the same figure at different DPI or quality hash alike,
+    unlike their bytes.
+    """
+    with Image.open(path) as image:
+        small = np.asarray(image.convert("L").resize((size, size), Image.LANCZOS), dtype=float)
+    return small > small.mean()
+
+
+def referenced_assets(markdown_path):
+    with open(markdown_path) as f:
+        text = f.read()
+    # Code blocks mention file names (e.g. a savefig call) without linking them
+    text = re.sub(r"```.*?```", "", text, flags=re.DOTALL)
+    names = set()
+    for match in REFERENCE_PATTERN.finditer(text):
+        names.add(os.path.basename(match.group(1) or match.group(2)))
+    return names
+
+
+def find_unreferenced_duplicates(post_dir, markdown_path, threshold=0.1):
+    """Return (unreferenced image, referenced image it duplicates) pairs.
+
+    Two images are duplicates when their average hashes differ in at most
+    `threshold` of their bits.
+    """
+    referenced = referenced_assets(markdown_path)
+    images = sorted(
+        name for name in os.listdir(post_dir) if name.lower().endswith(STILL_EXTENSIONS)
+    )
+    hashes = {name: average_hash(os.path.join(post_dir, name)) for name in images}
+
+    duplicates = []
+    for a, b in itertools.combinations(images, 2):
+        if np.mean(hashes[a] != hashes[b]) > threshold:
+            continue
+        for unused, used in ((a, b), (b, a)):
+            if unused not in referenced and used in referenced:
+                duplicates.append((unused, used))
+    return duplicates
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Shrink the post's animations and flag duplicate images it doesn't use."
+    )
+    parser.add_argument("gifs", nargs="*", help="GIFs to optimize (default: all in the post)")
+    parser.add_argument("--post-dir", default=POST_DIR)
+    parser.add_argument("--markdown", default=POST_MARKDOWN)
+    parser.add_argument(
+        "--formats", nargs="+", choices=("webp", "mp4", "gif"), default=["webp", "mp4", "gif"]
+    )
+    args = parser.parse_args()
+
+    gifs = args.gifs or sorted(
+        os.path.join(args.post_dir, name)
+        for name in os.listdir(args.post_dir)
+        if name.endswith(".gif")
+    )
+    for gif in gifs:
+        before = os.path.getsize(gif)
+        frames, kept, sizes = optimize_animation(gif, args.formats)
+        print(f"{os.path.basename(gif)}: {frames} frames -> {kept} after de-duplication")
+        for path, size in sizes.items():
+            print(f"  {os.path.basename(path):<24} {size / 1024:>8.0f} KiB")
+        print(f"  {'(original GIF)':<24} {before / 1024:>8.0f} KiB")
+
+    for unused, used in find_unreferenced_duplicates(args.post_dir, args.markdown):
+        print(f"DUPLICATE {unused} is not referenced by the post and looks like {used}")
@@ -0,0 +1,230 @@
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from render_scenes import QUALITY_FLAGS, SCENE_DIR, find_scenes
+
+BASELINE_PATH = os.path.join(SCENE_DIR, "profile_baseline.json")
+
+
+class SceneProfiler:
+    """Record how long each play/wait call of a scene takes, frame by frame.
+
+    The scene's play, wait and emit_frame are wrapped on the instance, so
+    the scene classes themselves are untouched.
+    """
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.records = []
+        self.frame_times = None
+        self.last_frame = None
+        scene.play = self.wrap(scene.play, "play")
+        scene.wait = self.wrap(scene.wait, "wait")
+        scene.emit_frame = self.wrap_emit_frame(scene.emit_frame)
+
+    def wrap(self, method, kind):
+        def profiled(*args, **kwargs):
+            # Nested calls (e.g. wait inside play) are counted by the outer one
+            if self.frame_times is not None:
+                return method(*args, **kwargs)
+
+            self.frame_times = []
+            start = self.last_frame = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(kind, args, time.perf_counter() - start)
+                self.frame_times = None
+
+        return profiled
+
+    def wrap_emit_frame(self, method):
+        def profiled():
+            method()
+            if self.frame_times is not None:
+                now = time.perf_counter()
+                self.frame_times.append(now - self.last_frame)
+                self.last_frame = now
+
+        return profiled
+
+    def record(self, kind, args, wall_time):
+        family = [mob for top in self.scene.mobjects for mob in top.get_family()]
+        frames = self.frame_times
+        if kind == "play":
+            label = ", ".join(type(anim).__name__ for anim in args)
+        else:
+            label = f"wait({args[0] if args else ''})"
+        self.records.append({
+            "index": len(self.records),
+            "kind": kind,
+            "label": label,
+            "wall_time": wall_time,
+            "frames": len(frames),
+            "mean_frame_ms": 1000 * sum(frames) / len(frames) if frames else 0.0,
+            "max_frame_ms": 1000 * max(frames) if frames else 0.0,
+            "mobjects": len(family),
+            "points": sum(mob.get_num_points() for mob in family),
+        })
+
+    def report(self):
+        return {
+            "wall_time": sum(r["wall_time"] for r in self.records),
+            "frames": sum(r["frames"] for r in self.records),
+            "animations": self.records,
+        }
+
+
+def profile_in_process(path, scene_name, quality, report_path):
+    """Run one scene under SceneProfiler and write its JSON report.
+
+    manimgl reads its configuration from sys.argv when first imported, so
+    this runs in a child process with the argv of an equivalent render.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        sys.argv = [
+            "manimgl",
+            path,
+            scene_name,
+            "--write_file",
+            "--quiet",
+            "--video_dir",
+            tmp,
+            *QUALITY_FLAGS[quality],
+        ]
+        from manimlib.config import manim_config
+
+        spec = importlib.util.spec_from_file_location("scene_module", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        scene = getattr(module, scene_name)(**manim_config.scene)
+        profiler = SceneProfiler(scene)
+        start = time.perf_counter()
+        scene.run()
+        elapsed = time.perf_counter() - start
+
+    report = {
+        "scene": scene_name,
+        "file": os.path.basename(path),
+        "quality": quality,
+        "resolution": list(manim_config.camera.resolution),
+        "fps": manim_config.camera.fps,
+        "run_time": elapsed,
+        **profiler.report(),
+    }
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def profile_scenes(scenes=None, quality="low", out_dir="profile-results"):
+    """Profile each scene in its own process and return their reports."""
+    os.makedirs(out_dir, exist_ok=True)
+    reports = []
+    # One scene at a time, so renders don't compete for the CPU/GPU
+    for path, scene in find_scenes():
+        if scenes and scene not in scenes:
+            continue
+        report_path = os.path.abspath(os.path.join(out_dir, f"{scene}.json"))
+        subprocess.run(
+            [sys.executable, __file__, "--child", path, scene, report_path, "--quality", quality],
+            check=True,
+            cwd=SCENE_DIR,
+        )
+        with open(report_path) as f:
+            reports.append(json.load(f))
+    return reports
+
+
+def print_report(report, top=5):
+    print(
+        f"{report['scene']}: {report['run_time']:.2f} s, {report['frames']} frames "
+        f"at {report['resolution'][0]}x{report['resolution'][1]}"
+    )
+    slowest = sorted(report["animations"], key=lambda r: r["wall_time"], reverse=True)
+    print(
+        f"  {'#':>3} {'Seconds':>8} {'Frames':>7} {'Mean ms':>8} {'Max ms':>8} "
+        f"{'Mobjects':>9} {'Points':>8}  Animation"
+    )
+    for r in slowest[:top]:
+        print(
+            f"  {r['index']:>3} {r['wall_time']:>8.2f} {r['frames']:>7} {r['mean_frame_ms']:>8.1f} "
+            f"{r['max_frame_ms']:>8.1f} {r['mobjects']:>9} {r['points']:>8}  {r['label']}"
+        )
+
+
+def check_against_baseline(reports, baseline_path, tolerance=0.25):
+    """Return a list of scenes whose render time grew more than `tolerance`."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    failures = []
+    for report in reports:
+        expected = baseline.get(report["scene"])
+        if expected is None:
+            failures.append(f"{report['scene']}: missing from baseline")
+            continue
+        got, want = report["run_time"], expected["run_time"]
+        if got > want * (1 + tolerance):
+            failures.append(f"{report['scene']}: {got:.2f} s vs baseline {want:.2f} s")
+    return failures
+
+
+def write_baseline(reports, baseline_path):
+    baseline = {
+        report["scene"]: {"run_time": report["run_time"], "frames": report["frames"]}
+        for report in reports
+    }
+    with open(baseline_path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Profile the linear regression scenes animation by animation."
+    )
+    parser.add_argument("scenes", nargs="*", help="scene classes to profile (default: all)")
+    parser.add_argument("--quality", choices=QUALITY_FLAGS, default="low")
+    parser.add_argument("--out", default="profile-results", help="directory for the JSON reports")
+    parser.add_argument("--top", type=int, default=5, help="slowest animations to print per scene")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="exit non-zero if a scene is slower than the stored baseline",
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="store these timings as the baseline"
+    )
+    parser.add_argument(
+        "--child", nargs=3, metavar=("FILE", "SCENE", "REPORT"), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.child:
+        profile_in_process(*args.child, args.quality)
+        sys.exit(0)
+
+    reports = profile_scenes(args.scenes, args.quality, args.out)
+    for report in reports:
+        print_report(report, args.top)
+    with open(os.path.join(args.out, "profile-report.json"), "w") as f:
+        json.dump(reports, f, indent=2)
+
+    if args.update_baseline:
+        write_baseline(reports, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+    elif args.check:
+        if not os.path.exists(args.baseline):
+            sys.exit(f"No baseline at {args.baseline}; record one with --update-baseline")
+        failures = check_against_baseline(reports, args.baseline, args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        sys.exit(1 if failures else 0)
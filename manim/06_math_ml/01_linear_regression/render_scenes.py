@@ -0,0 +1,257 @@
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
+
+from dataset import DATASET_ENV, SALARY_CSV
+
+SCENE_DIR = os.path.dirname(os.path.abspath(__file__))
+POST_DIR = os.path.join(
+    SCENE_DIR,
+    "..",
+    "..",
+    "..",
+    "jfgrea27.github.io",
+    "static",
+    "posts",
+    "06-ml-math",
+    "01-linear-regression",
+)
+CACHE_PATH = os.path.join(SCENE_DIR, "render-cache.json")
+
+# Base classes that make a class a manimgl scene
+SCENE_BASES = {"Scene", "ThreeDScene", "InteractiveScene"}
+
+# The names the post already links to; other scenes get a kebab-case name
+OUTPUT_NAMES = {
+    "CoordinateSystemExample": "scatter-plot",
+    "YDistanceExample": "y-distance",
+    "CostSurfaceGradientDescent": "cost-surface",
+}
+
+QUALITY_FLAGS = {"low": ["-l"], "medium": ["-m"], "hd": ["--hd"], "default": []}
+
+
+def output_name(scene):
+    return OUTPUT_NAMES.get(scene) or re.sub(r"(?<!^)(?=[A-Z])", "-", scene).lower()
+
+
+def find_scenes(scene_dir=SCENE_DIR):
+    """Return (file, scene class) for every scene defined in `scene_dir`.
+
+    Files are parsed rather than imported, so finding scenes needs neither
+    manimgl nor a display. A class is a scene if it derives from a manimgl
+    scene base or from another scene in the same file.
+    """
+    scenes = []
+    for name in sorted(os.listdir(scene_dir)):
+        if not name.endswith(".py"):
+            continue
+        path = os.path.join(scene_dir, name)
+        with open(path) as f:
+            tree = ast.parse(f.read(), path)
+
+        known = set(SCENE_BASES)
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            bases = {base.id for base in node.bases if isinstance(base, ast.Name)}
+            if bases & known:
+                known.add(node.name)
+                scenes.append((path, node.name))
+    return scenes
+
+
+def local_imports(path, scene_dir=SCENE_DIR, seen=None):
+    """The scene file plus every module next to it that it imports, recursively."""
+    seen = set() if seen is None else seen
+    if path in seen:
+        return seen
+    seen.add(path)
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules = [node.module]
+        else:
+            continue
+        for module in modules:
+            candidate = os.path.join(scene_dir, f"{module}.py")
+            if os.path.exists(candidate):
+                local_imports(candidate, scene_dir, seen)
+    return seen
+
+
+def manimgl_version():
+    try:
+        return metadata.version("manimgl")
+    except metadata.PackageNotFoundError:
+        return "not installed"
+
+
+def dataset_path():
+    """The CSV the scenes will read, if LINREG_DATASET points them at one."""
+    source = os.environ.get(DATASET_ENV)
+    if not source:
+        return None
+    return SALARY_CSV if source == "salary" else source
+
+
+def scene_hash(path, scene, quality):
+    """Hash everything the rendered output depends on.
+
+    That is the scene's source and the local modules it imports (which hold
+    the default data points), the external dataset if one is selected, the
+    render quality and the manimgl version.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{scene}\0{quality}\0{manimgl_version()}\0".encode())
+    for source in sorted(local_imports(path)):
+        digest.update(os.path.basename(source).encode() + b"\0")
+        with open(source, "rb") as f:
+            digest.update(f.read())
+
+    data = dataset_path()
+    if data:
+        digest.update(b"dataset\0")
+        with open(data, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def load_cache(cache_path=CACHE_PATH):
+    if not os.path.exists(cache_path):
+        return {}
+    with open(cache_path) as f:
+        return json.load(f)
+
+
+def save_cache(cache, cache_path=CACHE_PATH):
+    # Write then rename, so an interrupted build never leaves a corrupt cache
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, cache_path)
+
+
+def render_scene(path, scene, out_path, quality):
+    """Render one scene to a GIF at `out_path` with the manimgl CLI.
+
+    The WebP/MP4 alternatives the post serves ahead of the GIF are then
+    regenerated from it, so they never show an older animation.
+    """
+    stem = os.path.splitext(os.path.basename(out_path))[0]
+    start = time.perf_counter()
+    # Render into a scratch directory and move the result into place, so a
+    # failed render never replaces the published GIF with a partial one
+    with tempfile.TemporaryDirectory() as tmp:
+        subprocess.run(
+            [
+                "manimgl",
+                path,
+                scene,
+                "--write_file",
+                "--gif",
+                "--quiet",
+                "--video_dir",
+                tmp,
+                "--file_name",
+                stem,
+                *QUALITY_FLAGS[quality],
+            ],
+            check=True,
+            cwd=SCENE_DIR,
+        )
+        shutil.move(os.path.join(tmp, f"{stem}.gif"), out_path)
+
+    # Imported here: optimize_assets imports this module, and needs Pillow
+    from optimize_assets import optimize_animation
+
+    # Drop the old alternatives first, so one that can't be rebuilt here
+    # (no ffmpeg for the MP4) isn't left serving the previous animation
+    stem_path = os.path.splitext(out_path)[0]
+    for ext in ("webp", "mp4"):
+        if os.path.exists(f"{stem_path}.{ext}"):
+            os.remove(f"{stem_path}.{ext}")
+    optimize_animation(out_path)
+    return time.perf_counter() - start
+
+
+def build(scenes=None, out_dir=POST_DIR, quality="default", workers=None, force=False):
+    """Render every scene whose inputs changed since its output was last built.
+
+    Returns (scene, status, seconds) per scene, where status is "cached",
+    "rendered" or "failed".
+    """
+    found = find_scenes()
+    if scenes:
+        found = [(path, scene) for path, scene in found if scene in scenes]
+
+    cache = load_cache()
+    results = []
+    todo = []
+    for path, scene in found:
+        out_path = os.path.join(out_dir, f"{output_name(scene)}.gif")
+        digest = scene_hash(path, scene, quality)
+        webp_path = f"{os.path.splitext(out_path)[0]}.webp"
+        outputs = (out_path, webp_path)
+        if not force and cache.get(scene) == digest and all(map(os.path.exists, outputs)):
+            results.append((scene, "cached", 0.0))
+        else:
+            todo.append((path, scene, out_path, digest))
+
+    # Each render is its own manimgl process; the threads only wait on them
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(render_scene, path, scene, out_path, quality): (scene, digest)
+            for path, scene, out_path, digest in todo
+        }
+        for future, (scene, digest) in futures.items():
+            try:
+                elapsed = future.result()
+            except (subprocess.CalledProcessError, OSError) as e:
+                print(f"{scene}: {e}", file=sys.stderr)
+                results.append((scene, "failed", 0.0))
+                continue
+            cache[scene] = digest
+            save_cache(cache)
+            results.append((scene, "rendered", elapsed))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Render the linear regression scenes whose source or data changed."
+    )
+    parser.add_argument("scenes", nargs="*", help="scene classes to build (default: all)")
+    parser.add_argument("--out", default=POST_DIR, help="output directory")
+    parser.add_argument("--quality", choices=QUALITY_FLAGS, default="default")
+    parser.add_argument("--workers", type=int, help="parallel renders (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="ignore the cache")
+    parser.add_argument("--list", action="store_true", help="list scenes and their outputs")
+    args = parser.parse_args()
+
+    if args.list:
+        for path, scene in find_scenes():
+            print(f"{os.path.basename(path)}:{scene} -> {output_name(scene)}.gif")
+        sys.exit(0)
+
+    start = time.perf_counter()
+    results = build(args.scenes, args.out, args.quality, args.workers, args.force)
+    for scene, status, elapsed in results:
+        print(f"{scene:<32} {status:<9} {elapsed:>7.1f} s")
+    print(f"Built in {time.perf_counter() - start:.1f} s")
+    sys.exit(1 if any(status == "failed" for _, status, _ in results) else 0)
@@ -1,76 +1,52 @@
+import os
+import sys
+
+import numpy as np
 from manimlib import *
-from matplotlib.pyplot import axes
+
+# manimgl loads scenes by file path, so make the shared modules next to them importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dataset import load_dataset
+from fixtures import ResidualLines, make_axes, make_dots
 
 
 class CoordinateSystemExample(Scene):
     def construct(self):
-        axes = Axes(
-            # x-axis ranges from -1 to 10, with a default step size of 1
-            x_range=(0, 10),
-            # y-axis ranges from -2 to 2 with a step size of 0.5
-            y_range=(0, 20),
-            # The axes will be stretched so as to match the specified
-            # height and width
-            height=6,
-            width=10,
-            # Axes is made of two NumberLine mobjects.  You can specify
-            # their configuration with axis_config
-            axis_config={
-                "stroke_color": GREY_A,
-                "stroke_width": 2,
-            },
-            # Alternatively, you can specify configuration for just one
-            # of them, like this.
-            y_axis_config={
-                "include_tip": False,
-            },
-        )
-        # Keyword arguments of add_coordinate_labels can be used to
-        # configure the DecimalNumber mobjects which it creates and
-        # adds to the axes
-        axes.add_coordinate_labels(
-            font_size=20,
-            num_decimal_places=1,
-        )
+        dataset = load_dataset()
+        axes = make_axes(dataset)
         self.add(axes)
 
-        # Data points that roughly follow y = 2x + 1 with noisy scatter
-        data_points = [
-            (0.5, 3.0),
-            (1, 1.8),
-            (1.5, 4.5),
-            (5, 12.5),
-            (5.5, 10.0),
-            (6, 11.3),
-            (6.5, 14.8),
-            (7, 13.0),
-            (7.3, 16.2),
-            (8, 15.5),
-            (8.5, 18.0),
-            (9, 17.2),
-            (9.5, 19.5),
-        ]
-
-        dots = VGroup()
-        for x, y in data_points:
-            dot = Dot(color=RED)
-            dot.move_to(axes.c2p(x, y))
-            dots.add(dot)
+        # Data points that roughly follow the best-fit line with noisy scatter
+        dots = make_dots(axes, dataset)
 
         self.play(FadeIn(dots, scale=0.5))
         self.wait(0.5)
 
+        # The animated values below were chosen for (0, 10) x (0, 20) axes;
+        # scale them so other datasets get the same motion relative to their axes
+        x_scale = dataset.x_range[1] / 10
+        y_scale = dataset.y_range[1] / 20
+
         # Line parameters: y = mx + b
-        slope = ValueTracker(1.0)
-        intercept = ValueTracker(5.0)
+        slope = ValueTracker(1.0 * y_scale / x_scale)
+        intercept = ValueTracker(5.0 * y_scale)
+
+        # Create the line of best fit, spanning the x axis. It is built once
+        # and its end points moved by an updater rather than redrawn each frame
+        x_min, x_max = dataset.x_range[:2]
 
-        # Create the line of best fit
-        def get_line():
+        def update_line(line):
             m = slope.get_value()
             b = intercept.get_value()
-            return axes.get_graph(lambda x: m * x + b, color=BLUE)
+            line.put_start_and_end_on(
+                axes.c2p(x_min, m * x_min + b),
+                axes.c2p(x_max, m * x_max + b),
+            )
 
-        line = always_redraw(get_line)
+        line = Line(color=BLUE)
+        update_line(line)
+        line.add_updater(update_line)
 
         # Green dot on y-axis representing theta_0 (y-intercept)
         theta0_dot = Dot(radius=0.15)
@@ -80,37 +56,34 @@ class CoordinateSystemExample(Scene):
         theta0_dot.add_updater(lambda d: d.move_to(axes.c2p(0, intercept.get_value())))
 
         # Orange delta triangle representing theta_1 (slope = rise/run)
-        def get_slope_triangle():
+        # Triangle starts at x=2 on the line
+        x_start = 2 * x_scale
+        run = 2 * x_scale  # horizontal distance
+
+        # The triangle: horizontal line, vertical line, and labels. The labels
+        # are typeset once here and only moved as the line changes
+        horizontal = Line(color=ORANGE, stroke_width=3)
+        vertical = Line(color=ORANGE, stroke_width=3)
+        run_label = Text("Δx", font_size=24, color=ORANGE)
+        rise_label = Text("Δy", font_size=24, color=ORANGE)
+
+        def update_slope_triangle(triangle):
             m = slope.get_value()
             b = intercept.get_value()
-            # Triangle starts at x=2 on the line
-            x_start = 2
-            run = 2  # horizontal distance
             y_start = m * x_start + b
             y_end = m * (x_start + run) + b
-
-            # Create the triangle: horizontal line, vertical line, and labels
-            horizontal = Line(
-                axes.c2p(x_start, y_start),
-                axes.c2p(x_start + run, y_start),
-                color=ORANGE,
-                stroke_width=3,
+            corner, start, end = axes.c2p(
+                np.array([x_start + run, x_start, x_start + run]),
+                np.array([y_start, y_start, y_end]),
             )
-            vertical = Line(
-                axes.c2p(x_start + run, y_start),
-                axes.c2p(x_start + run, y_end),
-                color=ORANGE,
-                stroke_width=3,
-            )
-            # Labels for run and rise
-            run_label = Text("Δx", font_size=24, color=ORANGE)
+            horizontal.put_start_and_end_on(start, corner)
+            vertical.put_start_and_end_on(corner, end)
             run_label.next_to(horizontal, DOWN, buff=0.1)
-            rise_label = Text("Δy", font_size=24, color=ORANGE)
             rise_label.next_to(vertical, RIGHT, buff=0.1)
 
-            return VGroup(horizontal, vertical, run_label, rise_label)
-
-        slope_triangle = always_redraw(get_slope_triangle)
+        slope_triangle = VGroup(horizontal, vertical, run_label, rise_label)
+        update_slope_triangle(slope_triangle)
+        slope_triangle.add_updater(update_slope_triangle)
 
         # Create theta labels with dynamic values (using Text to avoid LaTeX dependency)
         theta0_label = Text("θ₀ = ", font_size=36).set_color(GREEN)
@@ -139,37 +112,27 @@ class CoordinateSystemExample(Scene):
         self.wait(0.5)
 
         # Create delta lines (residuals) from points to the line
-        def get_deltas():
-            m = slope.get_value()
-            b = intercept.get_value()
-            deltas = VGroup()
-            for x, y in data_points:
-                y_pred = m * x + b
-                delta_line = Line(
-                    axes.c2p(x, y),
-                    axes.c2p(x, y_pred),
-                    color=YELLOW,
-                    stroke_width=2,
-                )
-                deltas.add(delta_line)
-            return deltas
-
-        deltas = always_redraw(get_deltas)
+        deltas = ResidualLines(
+            axes, dataset, line=(intercept.get_value(), slope.get_value())
+        ).track(intercept, slope)
         self.play(FadeIn(deltas))
         self.wait(0.5)
 
+        # Settle on the dataset's line of best fit
+        final_intercept, final_slope = dataset.line
+
         # Animate changing the y-intercept
         self.play(intercept.animate.set_value(0), run_time=2)
         self.wait(0.3)
-        self.play(intercept.animate.set_value(8), run_time=2)
+        self.play(intercept.animate.set_value(8 * y_scale), run_time=2)
         self.wait(0.3)
-        self.play(intercept.animate.set_value(1), run_time=1.5)
+        self.play(intercept.animate.set_value(final_intercept), run_time=1.5)
         self.wait(0.5)
 
         # Animate changing the gradient/slope
-        self.play(slope.animate.set_value(0.5), run_time=2)
+        self.play(slope.animate.set_value(0.5 * y_scale / x_scale), run_time=2)
         self.wait(0.3)
-        self.play(slope.animate.set_value(3.0), run_time=2)
+        self.play(slope.animate.set_value(3.0 * y_scale / x_scale), run_time=2)
         self.wait(0.3)
-        self.play(slope.animate.set_value(2.0), run_time=1.5)
+        self.play(slope.animate.set_value(final_slope), run_time=1.5)
         self.wait(1)
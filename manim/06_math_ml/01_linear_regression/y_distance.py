@@ -1,63 +1,34 @@
+import os
+import sys
+
 from manimlib import *
 
+# manimgl loads scenes by file path, so make the shared modules next to them importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dataset import load_dataset
+from fixtures import make_axes, make_dots
+
 
 class YDistanceExample(Scene):
     def construct(self):
-        # Same axes as scatter_plot.py
-        axes = Axes(
-            x_range=(0, 10),
-            y_range=(0, 20),
-            height=6,
-            width=10,
-            axis_config={
-                "stroke_color": GREY_A,
-                "stroke_width": 2,
-            },
-            y_axis_config={
-                "include_tip": False,
-            },
-        )
-        axes.add_coordinate_labels(
-            font_size=20,
-            num_decimal_places=1,
-        )
-
-        # Same data points as scatter_plot.py
-        data_points = [
-            (0.5, 3.0),
-            (1, 1.8),
-            (1.5, 4.5),
-            (5, 12.5),
-            (5.5, 10.0),
-            (6, 11.3),
-            (6.5, 14.8),
-            (7, 13.0),
-            (7.3, 16.2),
-            (8, 15.5),
-            (8.5, 18.0),
-            (9, 17.2),
-            (9.5, 19.5),
-        ]
+        # Same axes and data points as scatter_plot.py
+        dataset = load_dataset()
+        axes = make_axes(dataset)
 
         # Create all the dots
-        dots = VGroup()
-        for x, y in data_points:
-            dot = Dot(color=RED)
-            dot.move_to(axes.c2p(x, y))
-            dots.add(dot)
-
-        # Final line of best fit: y = 2x + 1
-        slope = 2.0
-        intercept = 1.0
+        dots = make_dots(axes, dataset)
+
+        # Final line of best fit (y = 2x + 1 for the default points)
+        intercept, slope = dataset.line
         line = axes.get_graph(lambda x: slope * x + intercept, color=BLUE)
 
         # Show everything at once (final state from scatter_plot.py)
         self.add(axes, dots, line)
         self.wait(1)
 
-        # Pick a specific point to highlight (index 3: x=5, y=12.5)
-        x_i = 5
-        y_i = 12.5
+        # Pick a specific point to highlight (index 3: x=5, y=12.5 by default)
+        x_i, y_i = dataset.points[dataset.highlight]
         y_hat_i = slope * x_i + intercept  # Predicted: 2*5 + 1 = 11
 
         # Highlight the chosen point